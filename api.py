@@ -0,0 +1,214 @@
+"""Read-only JSON API over the league database, for bots and stream overlays.
+
+Run it next to the Streamlit app:
+
+    python api.py --port 8502
+
+Endpoints (all GET):
+    /leagues                              leagues with their seasons and data versions
+    /seasons/<id>/standings               the ranked table
+    /seasons/<id>/upcoming?limit=5        next fixtures with home/draw/away odds
+    /seasons/<id>/results?limit=5         latest results
+    /seasons/<id>/fixtures?player=&round=&after=<round>,<id>   one page of the schedule
+    /seasons/<id>/stats                   season summary and player statistics
+
+Responses carry an ETag built from the league's data and schedule versions, so
+polling clients get a bodiless 304 until a result or kickoff changes, and are
+gzipped for clients that accept it.
+"""
+import argparse
+import gzip
+import json
+import re
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import db
+import leagues
+import player_stats
+import ratings
+import scheduling
+import standings
+
+# Bodies smaller than this go out uncompressed; gzip's framing would outweigh the savings
+GZIP_MIN_BYTES = 512
+MAX_LIMIT = 100
+
+
+class NotFound(Exception):
+    pass
+
+
+def league_state(conn, season_id):
+    """(league_id, data_version, schedule_version, tiebreakers text) of the league a season belongs to."""
+    row = conn.execute("""SELECT l.id, l.data_version, l.schedule_version, l.tiebreakers
+                          FROM seasons s JOIN leagues l ON l.id = s.league_id WHERE s.id = ?""",
+                       (season_id,)).fetchone()
+    if row is None:
+        raise NotFound(f"No season {season_id}")
+    return row
+
+
+def int_param(query, name, default=None):
+    values = query.get(name)
+    return int(values[0]) if values else default
+
+
+def limit_param(query, default):
+    """The limit parameter clamped to 1..MAX_LIMIT; SQLite reads a negative LIMIT as no limit at all."""
+    return max(1, min(int_param(query, "limit", default), MAX_LIMIT))
+
+
+def cursor_param(query):
+    """The after=<round>,<id> cursor as a pair of ints, or None."""
+    values = query.get("after")
+    if not values:
+        return None
+    parts = values[0].split(",")
+    if len(parts) != 2:
+        raise ValueError("after must be <round>,<id>")
+    return int(parts[0]), int(parts[1])
+
+
+def get_leagues(conn, season_id, versions, query):
+    return [
+        {"id": league_id, "name": name, "roster_size": roster_size,
+         "version": standings.data_version(conn, league_id),
+         "schedule_version": standings.schedule_version(conn, league_id),
+         "seasons": [{"id": i, "name": season} for i, season in leagues.load_seasons(conn, league_id)]}
+        for league_id, name, roster_size in leagues.load_leagues(conn)
+    ]
+
+
+def get_standings(conn, season_id, versions, query):
+    tiebreakers = leagues.load_season_tiebreakers(conn, season_id)
+    leaderboard = standings.get_leaderboard(conn, season_id, versions[0], tiebreakers=tiebreakers)
+    return {"tiebreakers": list(tiebreakers),
+            "table": [{"position": position, "player": player, **stats}
+                      for position, (player, stats) in enumerate(leaderboard, 1)]}
+
+
+def get_upcoming(conn, season_id, versions, query):
+    players = standings.load_season_players(conn, season_id)
+    odds = ratings.get_match_odds(conn, season_id, versions[0])
+    limit = limit_param(query, 5)
+    return [{"id": match_id, "round": round_num, "kickoff": kickoff,
+             "home": players[home_id], "away": players[away_id],
+             "odds": dict(zip(("home", "draw", "away"), odds[match_id])) if match_id in odds else None}
+            for match_id, home_id, away_id, round_num, kickoff in scheduling.load_upcoming(conn, season_id, limit)]
+
+
+def get_results(conn, season_id, versions, query):
+    players = standings.load_season_players(conn, season_id)
+    limit = limit_param(query, 5)
+    return [{"round": round_num, "home": players[home_id], "away": players[away_id],
+             "home_goals": home_goals, "away_goals": away_goals}
+            for home_id, away_id, home_goals, away_goals, round_num
+            in scheduling.load_recent_results(conn, season_id, limit)]
+
+
+def get_fixtures(conn, season_id, versions, query):
+    players = standings.load_season_players(conn, season_id)
+    limit = limit_param(query, scheduling.SCHEDULE_PAGE_SIZE)
+    # One row past the page tells whether another page follows, as on the Match Schedule page
+    rows = scheduling.load_schedule_page(conn, season_id, int_param(query, "player"), int_param(query, "round"),
+                                         cursor_param(query), limit + 1)
+    has_next, rows = len(rows) > limit, rows[:limit]
+    fixtures = [{"id": match_id, "round": round_num, "kickoff": kickoff,
+                 "home": players[home_id], "away": players[away_id],
+                 "home_goals": home_goals, "away_goals": away_goals}
+                for match_id, home_id, away_id, round_num, kickoff, home_goals, away_goals in rows]
+    # Cursor for the next page, or None on the last one
+    return {"fixtures": fixtures, "next": f"{rows[-1][3]},{rows[-1][0]}" if has_next else None}
+
+
+def get_stats(conn, season_id, versions, query):
+    stats = player_stats.get_player_stats(conn, season_id, versions[0])
+    return {"summary": standings.get_season_summary(conn, season_id, *versions),
+            "players": [{"player": name, **row} for name, row in stats.to_dict("index").items()]}
+
+
+# Path pattern -> handler(conn, season_id, (data_version, schedule_version), query); /leagues has no
+# season, so it gets None for both. Result-derived caches key on the data version alone
+ROUTES = [
+    (re.compile(r"/leagues/?"), get_leagues),
+    (re.compile(r"/seasons/(\d+)/standings/?"), get_standings),
+    (re.compile(r"/seasons/(\d+)/upcoming/?"), get_upcoming),
+    (re.compile(r"/seasons/(\d+)/results/?"), get_results),
+    (re.compile(r"/seasons/(\d+)/fixtures/?"), get_fixtures),
+    (re.compile(r"/seasons/(\d+)/stats/?"), get_stats),
+]
+
+
+def to_json(value):
+    """numpy scalars from the cached frames serialize as plain numbers."""
+    return value.item() if hasattr(value, "item") else str(value)
+
+
+class Handler(BaseHTTPRequestHandler):
+    server_version = "RamadhanLeagueAPI/1.0"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        for pattern, handler in ROUTES:
+            match = pattern.fullmatch(url.path)
+            if match:
+                break
+        else:
+            return self.send_json(404, {"error": f"Unknown path {url.path}"})
+        conn = db.get_connection()
+        try:
+            if match.groups():
+                season_id = int(match.group(1))
+                league_id, version, schedule, tiebreakers = league_state(conn, season_id)
+                versions = (version, schedule)
+                # Tiebreaker changes reorder the table without bumping the version
+                etag = f'"{league_id}.{version}.{schedule}.{zlib.crc32(tiebreakers.encode()):08x}"'
+            else:
+                season_id, versions = None, None
+                etag = '"' + ".".join(f"{i}:{v}:{s}" for i, v, s in conn.execute(
+                    "SELECT id, data_version, schedule_version FROM leagues ORDER BY id")) + '"'
+            if etag in self.headers.get("If-None-Match", ""):
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            body = handler(conn, season_id, versions, parse_qs(url.query))
+        except NotFound as e:
+            return self.send_json(404, {"error": str(e)})
+        except ValueError as e:
+            return self.send_json(400, {"error": str(e)})
+        self.send_json(200, body, etag)
+
+    def send_json(self, status, body, etag=None):
+        data = json.dumps(body, default=to_json, separators=(",", ":")).encode()
+        gzipped = "gzip" in self.headers.get("Accept-Encoding", "") and len(data) >= GZIP_MIN_BYTES
+        if gzipped:
+            data = gzip.compress(data, compresslevel=6)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Vary", "Accept-Encoding")
+        # Clients may keep responses but must revalidate them with the ETag
+        self.send_header("Cache-Control", "no-cache")
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+        if etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    args = parser.parse_args()
+    server = ThreadingHTTPServer((args.host, args.port), Handler)
+    print(f"Serving on http://{args.host}:{args.port}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""Bulk import and export of players, fixtures and results as CSV or Parquet.
+
+    python bulk.py import-players --league 1 players.csv
+    python bulk.py import-results --season 3 results.parquet [--correct] [--entered-by NAME]
+    python bulk.py export-players --league 1 players.csv
+    python bulk.py export-fixtures --season 3 fixtures.parquet
+    python bulk.py export-standings --season 3 table.csv
+
+Files are read and written in chunks, so seasons of any size stream through in
+bounded memory. Each import runs in one transaction: a bad row anywhere in the
+file rolls the whole import back. The fixtures format (round, home, away,
+kickoff, home_goals, away_goals) is what import-results reads, so an export
+can be loaded into another database.
+"""
+import argparse
+import math
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+import db
+import events
+import leagues
+import standings
+
+CHUNK_ROWS = 10_000
+FIXTURE_COLUMNS = ["round", "home", "away", "kickoff", "home_goals", "away_goals"]
+
+
+class InvalidFile(ValueError):
+    """A file that fails validation; lists every offending row rather than the first."""
+
+    def __init__(self, problems):
+        super().__init__("\n".join(problems[:50]) + (f"\n... and {len(problems) - 50} more" if len(problems) > 50 else ""))
+        self.problems = problems
+
+
+def read_chunks(path, chunk_rows=CHUNK_ROWS):
+    """DataFrames of up to chunk_rows rows from a .csv or .parquet file."""
+    path = Path(path)
+    if path.suffix == ".parquet":
+        try:
+            import pyarrow.parquet as pq
+        except ModuleNotFoundError:
+            raise SystemExit("Parquet files need pyarrow (pip install pyarrow)")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_rows, dtype={"name": str, "home": str, "away": str,
+                                                                    "kickoff": str})
+
+
+class ChunkWriter:
+    """Append DataFrames to a .csv or .parquet file chunk by chunk."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.parquet = self.path.suffix == ".parquet"
+        self.writer = None
+
+    def write(self, frame):
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self.writer is None:
+                self.writer = pq.ParquetWriter(self.path, table.schema)
+            self.writer.write_table(table.cast(self.writer.schema))
+        else:
+            frame.to_csv(self.path, mode="a" if self.writer else "w", header=not self.writer, index=False)
+            self.writer = True
+
+    def close(self):
+        if self.parquet and self.writer is not None:
+            self.writer.close()
+
+
+def require_columns(frame, columns):
+    missing = [col for col in columns if col not in frame.columns]
+    if missing:
+        raise InvalidFile([f"Missing column(s) {missing}; expected {columns}"])
+
+
+def import_players(conn, league_id, path):
+    """Register the names in a file's `name` column; names already in the league are skipped.
+
+    Returns the number of players added.
+    """
+    row = conn.execute("SELECT roster_size FROM leagues WHERE id = ?", (league_id,)).fetchone()
+    if row is None:
+        raise InvalidFile([f"No league {league_id}"])
+    roster_size, added = row[0], 0
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        known = set(standings.load_players(conn, league_id).values())
+        for chunk in read_chunks(path):
+            require_columns(chunk, ["name"])
+            names = chunk["name"].fillna("").str.strip()
+            problems = [f"Row {i + 2}: empty name" for i in names.index[names == ""]]
+            if problems:
+                raise InvalidFile(problems)
+            new = [name for name in dict.fromkeys(names) if name not in known]
+            if len(known) + len(new) > roster_size:
+                raise InvalidFile([f"The league's roster holds {roster_size} players; "
+                                   f"the file would bring it to {len(known) + len(new)}"])
+            conn.executemany("INSERT INTO players (league_id, name) VALUES (?, ?)", [(league_id, n) for n in new])
+            known.update(new)
+            added += len(new)
+    return added
+
+
+def whole_number(value, name):
+    """A file value as an int; fractions, infinities and text are errors rather than truncated."""
+    if pd.isna(value):
+        raise ValueError(f"{name} is missing")
+    number = float(value)
+    if not math.isfinite(number) or not number.is_integer():
+        raise ValueError(f"{name} must be a whole number, got {value!r}")
+    return int(number)
+
+
+def parse_kickoff(value):
+    if pd.isna(value) or value == "":
+        return None
+    return datetime.fromisoformat(str(value)).isoformat(timespec="minutes")
+
+
+def import_results(conn, season_id, path, correct=False, entered_by=None):
+    """Load fixtures and results; returns (fixtures created, results recorded, results corrected).
+
+    Rows are matched to the season's fixtures by (round, home, away); unmatched
+    rows create the fixture. Scores go through the event log like entries made in
+    the app. A score that differs from a recorded one is an error unless correct
+    is set, when it is logged as a correction.
+    """
+    season = conn.execute("SELECT league_id FROM seasons WHERE id = ?", (season_id,)).fetchone()
+    if season is None:
+        raise InvalidFile([f"No season {season_id}"])
+    ids = {name: player_id for player_id, name in standings.load_players(conn, season[0]).items()}
+    created = recorded = corrected = 0
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        fixtures = {(round_num, home, away): (match_id, home_goals, away_goals)
+                    for match_id, round_num, home, away, home_goals, away_goals in conn.execute(
+                        "SELECT id, round, home_id, away_id, home_goals, away_goals FROM matches WHERE season_id = ?",
+                        (season_id,))}
+        seen = set()
+        first_row = 2  # header is line 1
+        for chunk in read_chunks(path):
+            require_columns(chunk, ["round", "home", "away", "home_goals", "away_goals"])
+            problems, new, scores, corrections = [], [], [], []
+            for offset, row in enumerate(chunk.itertuples(index=False)):
+                line = f"Row {first_row + offset}"
+                home, away = ids.get(row.home), ids.get(row.away)
+                unknown = [name for name, player_id in ((row.home, home), (row.away, away)) if player_id is None]
+                if unknown:
+                    problems.append(f"{line}: unknown player(s) {unknown}")
+                    continue
+                if home == away:
+                    problems.append(f"{line}: {row.home} can't play themselves")
+                    continue
+                try:
+                    round_num = whole_number(row.round, "round")
+                    kickoff = parse_kickoff(getattr(row, "kickoff", None))
+                    goals = [None if pd.isna(g) else whole_number(g, "goals") for g in (row.home_goals, row.away_goals)]
+                except (TypeError, ValueError) as e:
+                    problems.append(f"{line}: {e}")
+                    continue
+                if round_num < 1:
+                    problems.append(f"{line}: round must be 1 or more")
+                    continue
+                if (goals[0] is None) != (goals[1] is None):
+                    problems.append(f"{line}: give both scores or neither")
+                    continue
+                if goals[0] is None:
+                    goals = None
+                elif min(goals) < 0:
+                    problems.append(f"{line}: goals can't be negative")
+                    continue
+                else:
+                    goals = tuple(goals)
+                key = (round_num, home, away)
+                if key in seen:
+                    problems.append(f"{line}: Round {round_num} {row.home} vs {row.away} is listed twice")
+                    continue
+                seen.add(key)
+                if key not in fixtures:
+                    new.append((season_id, home, away, round_num, kickoff))
+                    if goals:
+                        scores.append((*goals, key))
+                    continue
+                match_id, home_goals, away_goals = fixtures[key]
+                if goals is None or goals == (home_goals, away_goals):
+                    continue
+                if home_goals is None:
+                    scores.append((*goals, key))
+                elif correct:
+                    corrections.append((*goals, key))
+                else:
+                    problems.append(f"{line}: recorded as {home_goals}-{away_goals}, file says {goals[0]}-{goals[1]} "
+                                    "(pass --correct to overwrite)")
+            if problems:
+                raise InvalidFile(problems)
+            first_row += len(chunk)
+
+            if new:
+                last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM matches").fetchone()[0]
+                conn.executemany("INSERT INTO matches (season_id, home_id, away_id, round, kickoff) "
+                                 "VALUES (?, ?, ?, ?, ?)", new)
+                for match_id, round_num, home, away in conn.execute(
+                        "SELECT id, round, home_id, away_id FROM matches WHERE season_id = ? AND id > ?",
+                        (season_id, last_id)):
+                    fixtures[(round_num, home, away)] = (match_id, None, None)
+                created += len(new)
+            recorded += len(events.record_results(conn, [(hg, ag, fixtures[key][0]) for hg, ag, key in scores],
+                                                  entered_by))
+            corrected += len(events.record_results(conn, [(hg, ag, fixtures[key][0]) for hg, ag, key in corrections],
+                                                   entered_by, kind="correction"))
+    # Ratings and snapshots catch up from the log once the import is committed
+    events.process(conn, season_id)
+    return created, recorded, corrected
+
+
+def export_players(conn, league_id, path):
+    writer = ChunkWriter(path)
+    writer.write(pd.DataFrame({"name": list(standings.load_players(conn, league_id).values())}))
+    writer.close()
+
+
+def export_fixtures(conn, season_id, path):
+    """Stream a season's fixtures and results to a file in the import-results format."""
+    writer = ChunkWriter(path)
+    for chunk in pd.read_sql("""SELECT m.round, hp.name AS home, ap.name AS away, m.kickoff,
+                                       m.home_goals, m.away_goals
+                                FROM matches m JOIN players hp ON hp.id = m.home_id JOIN players ap ON ap.id = m.away_id
+                                WHERE m.season_id = ? ORDER BY m.round, m.id""",
+                             conn, params=(season_id,), chunksize=CHUNK_ROWS,
+                             dtype={"kickoff": "string", "home_goals": "Int64", "away_goals": "Int64"}):
+        writer.write(chunk[FIXTURE_COLUMNS])
+    writer.close()
+
+
+def export_standings(conn, season_id, path):
+    """The season table, ranked with its league's tiebreakers, as the Classification page shows it."""
+    leaderboard = standings.compute_leaderboard(conn, season_id,
+                                                tiebreakers=leagues.load_season_tiebreakers(conn, season_id))
+    frame = pd.DataFrame([{"Position": position, "Player": player, **stats}
+                          for position, (player, stats) in enumerate(leaderboard, 1)])
+    writer = ChunkWriter(path)
+    writer.write(frame)
+    writer.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name in ("import-players", "export-players"):
+        command = commands.add_parser(name)
+        command.add_argument("--league", type=int, required=True)
+        command.add_argument("path")
+    for name in ("import-results", "export-fixtures", "export-standings"):
+        command = commands.add_parser(name)
+        command.add_argument("--season", type=int, required=True)
+        command.add_argument("path")
+        if name == "import-results":
+            command.add_argument("--correct", action="store_true", help="overwrite recorded results that differ")
+            command.add_argument("--entered-by", help="name stored with each logged result")
+    args = parser.parse_args(argv)
+
+    conn = db.connect()
+    db.migrate(conn)
+    try:
+        if args.command == "import-players":
+            print(f"Added {import_players(conn, args.league, args.path)} player(s)")
+        elif args.command == "import-results":
+            created, recorded, corrected = import_results(conn, args.season, args.path, args.correct, args.entered_by)
+            print(f"Created {created} fixture(s), recorded {recorded} result(s), corrected {corrected}")
+        elif args.command == "export-players":
+            export_players(conn, args.league, args.path)
+        elif args.command == "export-fixtures":
+            export_fixtures(conn, args.season, args.path)
+        else:
+            export_standings(conn, args.season, args.path)
+    except InvalidFile as e:
+        sys.exit(f"Nothing imported:\n{e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import os
+import sqlite3
+import threading
+
+import streamlit as st
+
+from migrations import MIGRATIONS
+
+DB_PATH = os.environ.get("PES_LEAGUE_DB", "pes_league.db")
+# How long a writer waits for another writer's lock before raising "database is locked"
+BUSY_TIMEOUT_MS = 5000
+
+_local = threading.local()
+
+
+def connect(path=DB_PATH):
+    """Open a connection tuned for many concurrent readers and occasional score writes."""
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000)
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    # Safe with WAL: a crash can only lose the last commits, never corrupt the file
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA foreign_keys = ON")
+    return conn
+
+
+def statements(script):
+    """Split a migration script into single statements; trigger bodies stay whole."""
+    statement = ""
+    for line in script.splitlines(keepends=True):
+        statement += line
+        if sqlite3.complete_statement(statement):
+            yield statement
+            statement = ""
+
+
+def migrate(conn):
+    """Apply the pending numbered migrations, each in its own transaction; a no-op when current.
+
+    Each migration takes the write lock before re-reading user_version, so
+    processes opening a new database together apply every migration once.
+    executescript() would commit the lock away, hence statement by statement.
+    """
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= len(MIGRATIONS):
+        return
+    # Table rebuilds must not trigger cascades; integrity is checked before each commit instead
+    conn.execute("PRAGMA foreign_keys = OFF")
+    try:
+        while True:
+            conn.execute("BEGIN IMMEDIATE")
+            number = conn.execute("PRAGMA user_version").fetchone()[0] + 1
+            if number > len(MIGRATIONS):
+                conn.rollback()
+                break
+            for statement in statements(MIGRATIONS[number - 1]):
+                conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {number}")
+            if conn.execute("PRAGMA foreign_key_check").fetchone() is not None:
+                raise sqlite3.IntegrityError(f"Migration {number} left dangling foreign keys")
+            conn.commit()
+    except sqlite3.Error:
+        conn.rollback()
+        raise
+    finally:
+        conn.execute("PRAGMA foreign_keys = ON")
+
+
+@st.cache_resource(show_spinner=False)
+def init_database(path=DB_PATH):
+    """Once per process: switch the file to WAL (a persistent mode) and bring the schema up to date."""
+    conn = connect(path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    migrate(conn)
+    conn.close()
+    return path
+
+
+def get_connection(path=DB_PATH):
+    """Connection owned by the calling thread, so sessions never share cursor state."""
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+    conn = connections.get(path)
+    if conn is None:
+        init_database(path)
+        conn = connections[path] = connect(path)
+    return conn
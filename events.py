@@ -0,0 +1,185 @@
+import pandas as pd
+
+import ratings
+import snapshots
+
+# Every write to a fixture's result or kickoff goes through here: the matches row
+# is updated (standings follow through its triggers) and the change is appended to
+# match_events in the same transaction. Derived data that isn't trigger-maintained
+# catches up by reading the log from its consumer offset.
+
+EVENT_KINDS = ("result", "correction", "void", "kickoff")
+
+APPEND = """INSERT INTO match_events (season_id, match_id, kind, home_goals, away_goals, kickoff, entered_by)
+            SELECT season_id, id, ?, home_goals, away_goals, kickoff, ? FROM matches WHERE id = ?"""
+
+
+def record_result(conn, match_id, home_goals, away_goals, entered_by=None):
+    """Enter a fixture's first result; False, with nothing logged, if it already has one."""
+    updated = conn.execute("UPDATE matches SET home_goals = ?, away_goals = ? WHERE id = ? AND home_goals IS NULL",
+                           (home_goals, away_goals, match_id)).rowcount
+    if updated:
+        conn.execute(APPEND, ("result", entered_by, match_id))
+    return bool(updated)
+
+
+def record_results(conn, scores, entered_by=None, kind="result"):
+    """Batched record_result (or correct_result, with kind="correction") for (home_goals, away_goals, match_id) rows.
+
+    One read and two executemany statements for any number of fixtures.
+    Fixtures that already have a result (or, when correcting, have none) are
+    skipped, as is a fixture's second row. Call inside a transaction holding
+    the write lock (BEGIN IMMEDIATE), so no other session fills a fixture in
+    between the check and the update. Returns the rows written.
+    """
+    guard = "IS NOT NULL" if kind == "correction" else "IS NULL"
+    ids = list(dict.fromkeys(match_id for _, _, match_id in scores))
+    writable = {match_id for (match_id,) in conn.execute(
+        f"SELECT id FROM matches WHERE home_goals {guard} AND id IN ({', '.join('?' * len(ids))})", ids)}
+    rows = []
+    for score in scores:
+        if score[2] in writable:
+            rows.append(score)
+            writable.discard(score[2])
+    conn.executemany(f"UPDATE matches SET home_goals = ?, away_goals = ? WHERE id = ? AND home_goals {guard}", rows)
+    conn.executemany(APPEND, [(kind, entered_by, match_id) for _, _, match_id in rows])
+    return rows
+
+
+def correct_result(conn, match_id, home_goals, away_goals, entered_by=None):
+    """Overwrite a recorded result; False if the fixture has none to correct."""
+    updated = conn.execute("""UPDATE matches SET home_goals = ?, away_goals = ?
+                              WHERE id = ? AND home_goals IS NOT NULL""",
+                           (home_goals, away_goals, match_id)).rowcount
+    if updated:
+        conn.execute(APPEND, ("correction", entered_by, match_id))
+    return bool(updated)
+
+
+def void_result(conn, match_id, entered_by=None):
+    """Return a played fixture to pending, e.g. a match ordered to be replayed."""
+    updated = conn.execute("""UPDATE matches SET home_goals = NULL, away_goals = NULL
+                              WHERE id = ? AND home_goals IS NOT NULL""", (match_id,)).rowcount
+    if updated:
+        conn.execute(APPEND, ("void", entered_by, match_id))
+    return bool(updated)
+
+
+def change_kickoffs(conn, changes, entered_by=None):
+    """Apply (kickoff ISO string, match_id) pairs in two batched statements."""
+    conn.executemany("UPDATE matches SET kickoff = ? WHERE id = ?", changes)
+    conn.executemany(APPEND, [("kickoff", entered_by, match_id) for _, match_id in changes])
+
+
+def load_events(conn, season_id, after=0):
+    """A season's events past a sequence number, with each fixture's players where it still exists.
+
+    Rows are (seq, kind, home_id, away_id, home_goals, away_goals); removed fixtures have no players.
+    """
+    return conn.execute("""SELECT e.seq, e.kind, m.home_id, m.away_id, e.home_goals, e.away_goals
+                           FROM match_events e LEFT JOIN matches m ON m.id = e.match_id
+                           WHERE e.season_id = ? AND e.seq > ? ORDER BY e.seq""", (season_id, after)).fetchall()
+
+
+def update_ratings(conn, season_id, events):
+    """New results rate incrementally; a correction, void or removed fixture replays the season."""
+    results = [e for e in events if e[1] != "kickoff"]
+    if all(kind == "result" and home is not None for _, kind, home, *_ in results):
+        ratings.record_results(conn, season_id, [tuple(e[2:]) for e in results])
+    else:
+        ratings.replay_ratings(conn, season_id)
+
+
+def update_snapshots(conn, season_id, events):
+    """New results extend the snapshots; changing an earlier result replays them."""
+    if all(e[1] in ("result", "kickoff") for e in events):
+        snapshots.write_snapshots(conn, season_id)
+    else:
+        snapshots.replay_snapshots(conn, season_id)
+
+
+# Consumer name -> handler(conn, season_id, events) advancing that derived data
+CONSUMERS = {
+    "ratings": update_ratings,
+    "snapshots": update_snapshots,
+}
+
+
+def consumer_offset(conn, consumer, season_id):
+    row = conn.execute("SELECT last_seq FROM event_consumers WHERE consumer = ? AND season_id = ?",
+                       (consumer, season_id)).fetchone()
+    return row[0] if row else 0
+
+
+def set_offset(conn, consumer, season_id, seq):
+    conn.execute("""INSERT INTO event_consumers (consumer, season_id, last_seq) VALUES (?, ?, ?)
+                    ON CONFLICT (consumer, season_id) DO UPDATE SET last_seq = excluded.last_seq""",
+                 (consumer, season_id, seq))
+
+
+def process(conn, season_id):
+    """Advance every consumer over the season's events it hasn't read; call after the writes commit.
+
+    Each consumer reads its offset, moves its data and advances the offset in one
+    write transaction, so concurrent sessions never apply the same events twice
+    and an interrupted run resumes where it stopped.
+    """
+    for consumer, handler in CONSUMERS.items():
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            events = load_events(conn, season_id, consumer_offset(conn, consumer, season_id))
+            if events:
+                handler(conn, season_id, events)
+                set_offset(conn, consumer, season_id, events[-1][0])
+
+
+def replay(conn, season_id):
+    """Fold a season's log into each fixture's current (home_goals, away_goals): match_id -> goals."""
+    state = {}
+    for match_id, kind, home_goals, away_goals in conn.execute(
+            "SELECT match_id, kind, home_goals, away_goals FROM match_events WHERE season_id = ? ORDER BY seq",
+            (season_id,)):
+        if kind in ("result", "correction"):
+            state[match_id] = (home_goals, away_goals)
+        elif kind == "void":
+            state.pop(match_id, None)
+    return state
+
+
+def audit(conn, season_id):
+    """Fixtures whose stored result disagrees with the log, as (match_id, stored, logged) rows."""
+    logged = replay(conn, season_id)
+    stored = {match_id: (home_goals, away_goals) if home_goals is not None else None
+              for match_id, home_goals, away_goals in conn.execute(
+                  "SELECT id, home_goals, away_goals FROM matches WHERE season_id = ?", (season_id,))}
+    return [(match_id, goals, logged.get(match_id)) for match_id, goals in sorted(stored.items())
+            if goals != logged.get(match_id)]
+
+
+def rebuild_from_log(conn, season_id):
+    """Reset a season's results to what the log says, then replay every consumer from the start."""
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        logged = replay(conn, season_id)
+        conn.execute("UPDATE matches SET home_goals = NULL, away_goals = NULL WHERE season_id = ?", (season_id,))
+        conn.executemany("UPDATE matches SET home_goals = ?, away_goals = ? WHERE id = ?",
+                         [(home_goals, away_goals, match_id) for match_id, (home_goals, away_goals) in logged.items()])
+        ratings.replay_ratings(conn, season_id)
+        snapshots.replay_snapshots(conn, season_id)
+        last = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM match_events WHERE season_id = ?",
+                            (season_id,)).fetchone()[0]
+        for consumer in CONSUMERS:
+            set_offset(conn, consumer, season_id, last)
+
+
+def load_history(conn, season_id, limit=200):
+    """The latest entries of a season's log, newest first, with player names, for the audit view."""
+    return pd.read_sql("""SELECT e.seq AS "#", e.entered_at AS "When", e.kind AS "Event", m.round AS "Round",
+                                 hp.name AS "Home", e.home_goals AS "HG", e.away_goals AS "AG", ap.name AS "Away",
+                                 e.kickoff AS "Kickoff", e.entered_by AS "By"
+                          FROM match_events e
+                          LEFT JOIN matches m ON m.id = e.match_id
+                          LEFT JOIN players hp ON hp.id = m.home_id
+                          LEFT JOIN players ap ON ap.id = m.away_id
+                          WHERE e.season_id = ? ORDER BY e.seq DESC LIMIT ?""",
+                       conn, params=(season_id, limit)).astype({"Round": "Int64", "HG": "Int64", "AG": "Int64"})
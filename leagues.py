@@ -0,0 +1,60 @@
+import ranking
+
+MAX_ROSTER_SIZE = 500
+
+
+def load_leagues(conn):
+    """All leagues as (id, name, roster_size) rows, oldest first."""
+    return conn.execute("SELECT id, name, roster_size FROM leagues ORDER BY id").fetchall()
+
+
+def load_seasons(conn, league_id):
+    """A league's seasons as (id, name) rows, newest first."""
+    return conn.execute(
+        "SELECT id, name FROM seasons WHERE league_id = ? ORDER BY id DESC", (league_id,)
+    ).fetchall()
+
+
+def create_league(conn, name, roster_size, season_name):
+    """Create a league together with its first season and return the league id."""
+    if not 2 <= roster_size <= MAX_ROSTER_SIZE:
+        raise ValueError(f"Roster size must be between 2 and {MAX_ROSTER_SIZE}")
+    with conn:
+        league_id = conn.execute(
+            "INSERT INTO leagues (name, roster_size) VALUES (?, ?)", (name, roster_size)
+        ).lastrowid
+        conn.execute("INSERT INTO seasons (league_id, name) VALUES (?, ?)", (league_id, season_name))
+    return league_id
+
+
+def create_season(conn, league_id, name):
+    """Start a new season for a league's existing roster and return its id."""
+    with conn:
+        return conn.execute(
+            "INSERT INTO seasons (league_id, name) VALUES (?, ?)", (league_id, name)
+        ).lastrowid
+
+
+def load_tiebreakers(conn, league_id):
+    """The league's tiebreak chain, applied in order to players level on points."""
+    row = conn.execute("SELECT tiebreakers FROM leagues WHERE id = ?", (league_id,)).fetchone()
+    return ranking.parse_tiebreakers(row[0]) if row else ranking.DEFAULT_TIEBREAKERS
+
+
+def load_season_tiebreakers(conn, season_id):
+    """Tiebreak chain of the league a season belongs to."""
+    row = conn.execute("""SELECT l.tiebreakers FROM leagues l JOIN seasons s ON s.league_id = l.id
+                          WHERE s.id = ?""", (season_id,)).fetchone()
+    return ranking.parse_tiebreakers(row[0]) if row else ranking.DEFAULT_TIEBREAKERS
+
+
+def set_tiebreakers(conn, league_id, chain):
+    """Store a new tiebreak chain.
+
+    Caches of ranked tables and position history take the chain as part of
+    their key; stored snapshots were ranked with the old one and need
+    snapshots.rebuild_snapshots().
+    """
+    text = ",".join(ranking.parse_tiebreakers(",".join(chain)))
+    with conn:
+        conn.execute("UPDATE leagues SET tiebreakers = ? WHERE id = ?", (text, league_id))
@@ -1,465 +1,234 @@
 import streamlit as st
-import sqlite3
 from itertools import permutations
 import random
+from datetime import date, datetime
 import pandas as pd
-# Database setup
-conn = sqlite3.connect('pes_league.db', check_same_thread=False)
+import sqlite3
+import db
+import events
+import leagues
+import player_stats
+import ranking
+import ratings
+import rendering
+import scheduling
+import simulation
+import snapshots
+import standings
+# Database setup: each script run uses its own thread's connection; the schema
+# is migrated once per process
+conn = db.get_connection()
 c = conn.cursor()
 
-# Create tables if they don't exist
-c.execute('''CREATE TABLE IF NOT EXISTS players (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    name TEXT UNIQUE
-)''')
-
-c.execute('''CREATE TABLE IF NOT EXISTS matches (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    home_player TEXT,
-    away_player TEXT,
-    round TEXT,
-    time TEXT,
-    home_goals INTEGER,
-    away_goals INTEGER,
-    FOREIGN KEY (home_player) REFERENCES players (name),
-    FOREIGN KEY (away_player) REFERENCES players (name)
-)''')
-conn.commit()
-
-# Initialize session state
-if 'confirmed' not in st.session_state:
-    st.session_state.confirmed = False
 
-# Sidebar navigation with Dashboard as the default
-st.sidebar.title("PES 2025 Ramadhan League")
-page = st.sidebar.radio("Go to", ["Dashboard", "Player Registration", "Match Schedule", "League Classification"])
+def slot_settings():
+    """Match-night inputs for the slot allocator, as allocate_kickoffs() keyword arguments."""
+    col1, col2 = st.columns(2)
+    start = col1.date_input("First match night", date.today())
+    first_kickoff = col2.time_input("First kickoff", scheduling.DEFAULT_KICKOFF)
+    col1, col2, col3 = st.columns(3)
+    slots_per_night = col1.number_input("Kickoff slots per night", min_value=1, value=4)
+    stations = col2.number_input("Consoles", min_value=1, value=2)
+    slot_minutes = col3.number_input("Minutes per slot", min_value=5, step=5, value=scheduling.SLOT_MINUTES)
+    return dict(start=start, first_kickoff=first_kickoff, slots_per_night=slots_per_night,
+                stations=stations, slot_minutes=slot_minutes)
 
-# Page 1: Dashboard (New Main Page)
-if page == "Dashboard":
-    st.title("📊 League Dashboard")
-    
-    # Load players
-    c.execute("SELECT name FROM players")
-    players = [row[0] for row in c.fetchall()]
 
-    if not players:
-        st.warning("⚠️ No players registered yet. Go to Player Registration to start.")
+# Page sections. Each is an st.fragment, so interacting with one reruns only that
+# section; writes call st.rerun() to refresh the rest of the page. Fragment reruns
+# may run on another thread, hence each section takes its own thread's connection.
+@st.fragment(run_every=standings.LIVE_POLL_SECONDS)
+def live_updates(league_id):
+    """Rerun the page once the league's results or kickoffs change; until then each tick is two primary-key reads.
+
+    Every Dashboard section reads caches keyed on those versions, so the rerun
+    recomputes nothing the first viewer to see the change hasn't already.
+    """
+    conn = db.get_connection()
+    versions = (standings.data_version(conn, league_id), standings.schedule_version(conn, league_id))
+    if versions != st.session_state.get("live_version"):
+        st.rerun()
+
+
+@st.fragment
+def standings_cards(league_id, season_id):
+    conn = db.get_connection()
+    leaderboard = standings.get_leaderboard(conn, season_id, standings.data_version(conn, league_id),
+                                            tiebreakers=leagues.load_tiebreakers(conn, league_id))
+    # --- Current Standings Section ---
+    st.header("🏆 Premier League Standings", divider="rainbow")
+    if leaderboard:
+        rendering.section(rendering.podium(leaderboard))
     else:
-        standings = {p: {"Points": 0, "GD": 0, "Matches Played": 0, "Wins": 0, "Draws": 0, "Losses": 0, "Goals For": 0, "Goals Against": 0} for p in players}
-        c.execute("SELECT home_player, away_player, home_goals, away_goals FROM matches WHERE home_goals IS NOT NULL")
-        for home, away, home_goals, away_goals in c.fetchall():
-            standings[home]["Matches Played"] += 1
-            standings[away]["Matches Played"] += 1
-            standings[home]["Goals For"] += home_goals
-            standings[away]["Goals For"] += away_goals
-            standings[home]["Goals Against"] += away_goals
-            standings[away]["Goals Against"] += home_goals
-            standings[home]["GD"] += home_goals - away_goals
-            standings[away]["GD"] += away_goals - home_goals
-            if home_goals > away_goals:
-                standings[home]["Points"] += 3
-                standings[home]["Wins"] += 1
-                standings[away]["Losses"] += 1
-            elif home_goals < away_goals:
-                standings[away]["Points"] += 3
-                standings[away]["Wins"] += 1
-                standings[home]["Losses"] += 1
-            else:
-                standings[home]["Points"] += 1
-                standings[away]["Points"] += 1
-                standings[home]["Draws"] += 1
-                standings[away]["Draws"] += 1
-
-        # Sort leaderboard
-        leaderboard = sorted(standings.items(), key=lambda x: (-x[1]["Points"], -x[1]["GD"]))
-        def calculate_match_odds(position, total_players=10):
-            # Odds range from 1.2 (top) to 3.5 (bottom)
-            odds = 1.2 + (position - 1) * (2.3 / (total_players - 1))  # Linear scaling
-            return f"{odds:.1f} $"
-        # --- Current Standings Section ---
-        st.header("🏆 Premier League Standings", divider="rainbow")
-        if leaderboard:
-            # Create top 5 cards
-            cols = st.columns(4)
-            podium_emojis = ["👑", "🥈", "🥉", "4️⃣"]
-            
-            for idx in range(4):
-                if idx < len(leaderboard):
-                    player, stats = leaderboard[idx]
-                    with cols[idx]:
-                        # Different card colors for top 3
-                        card_color = "#37003C"  # Premier League purple
-                        if idx == 0:
-                            card_color = "linear-gradient(45deg, #37003C 0%, #E90052 100%)"
-                        elif idx == 1:
-                            card_color = "#1D428A"  # Secondary blue
-                        elif idx == 2:
-                            card_color = "#00A551"  # Premier League green
-
-                        st.markdown(f"""
-                            <div style="background: {card_color};
-                                        padding: 1.5rem;
-                                        border-radius: 15px;
-                                        border: 1px solid #00FF87;
-                                        text-align: center;
-                                        margin-bottom: 1rem;
-                                        box-shadow: 0 4px 8px rgba(0,0,0,0.2);
-                                        transition: transform 0.2s;
-                                        min-height: 220px;
-                                        display: flex;
-                                        flex-direction: column;
-                                        justify-content: space-between;">
-                                <div>
-                                    <div style="font-size: 2rem; margin-bottom: 0.5rem;">{podium_emojis[idx]}</div>
-                                    <h3 style="margin: 0.5rem 0; 
-                                            color: #00FF87; 
-                                            font-family: 'Arial Black', sans-serif;
-                                            text-shadow: 0 2px 4px rgba(0,0,0,0.5);">
-                                        {player}
-                                    </h3>
-                                </div>
-                                <div>
-                                    <div style="background: linear-gradient(45deg, #FFD700, #FFFFFF);
-                                                -webkit-background-clip: text;
-                                                color: transparent;
-                                                font-size: 1.8rem;
-                                                font-weight: bold;
-                                                margin: 0.5rem 0;">
-                                        {stats['Points']} pts
-                                    </div>
-                                    <div style="color: #FFFFFF;
-                                            font-size: 0.9rem;
-                                            border-top: 1px solid #00FF87;
-                                            padding-top: 0.5rem;
-                                            margin: 0 1rem;">
-                                        <div>🏃 GD: {stats['GD']:+}</div>
-                                        <div>✅ W: {stats['Wins']}</div>
-                                    </div>
-                                </div>
-                            </div>
-                        """, unsafe_allow_html=True)
-            
-            st.caption("""
-                <div style="color: #00FF87; font-size: 0.9rem; margin-top: -1rem;">
-                    🔺 Ramadhan League ranking system | GD: Goal Difference | MP: Matches Played
-                </div>
-            """, unsafe_allow_html=True)
-        else:
-            st.info("""
-                ⚽ No matches played yet. 
-                Standings will appear here after the first fixtures.
-            """)
-
-        # --- Upcoming Matches Section ---
-        st.header("⏩ Upcoming Matches", divider="orange")
-        c.execute("SELECT home_player, away_player, round, time FROM matches WHERE home_goals IS NULL AND away_goals IS NULL LIMIT 5")
-        upcoming_matches = c.fetchall()
-        
-        if upcoming_matches:
-            for home, away, round_num, time in upcoming_matches:
-                # Calculate odds with color coding
-                leaderboard_data = [
-            {"Position": idx + 1, "Player": p, "Points": s["Points"], "Goal Difference": s["GD"]}
-            for idx, (p, s) in enumerate(leaderboard)
-        ]
-                def get_odds_badge(odds):
-                    color = "#2ecc71" if float(odds[:-2]) < 2.0 else "#e74c3c"
-                    return f'<span style="background-color: {color}; color: white; padding: 0.2rem 0.5rem; border-radius: 15px;">{odds}</span>'
-                player_positions = {entry["Player"]: entry["Position"] for entry in leaderboard_data}
-                home_odds = calculate_match_odds(player_positions.get(home, 10))
-                away_odds = calculate_match_odds(player_positions.get(away, 10))
-                
-                st.markdown(f"""
-                    <div style="background-color: black; 
-                                padding: 1rem; 
-                                border-radius: 10px; 
-                                border: 1px solid #dee2e6;
-                                margin: 0.5rem 0;">
-                        <div style="display: flex; justify-content: space-between; color: white; align-items: center;">
-                            <div style="flex: 1; text-align: center;">
-                                <div style="font-weight: bold; font-size: 1.1rem;">{home}</div>
-                                {get_odds_badge(home_odds)}
-                            </div>
-                            <div style="flex: 0.5; text-align: center; color: white;">
-                                ⚔<br>
-                                <large>{round_num}</large><br>
-                                <large>{time}</large>
-                            </div>
-                            <div style="flex: 1; text-align: center;">
-                                <div style="font-weight: bold; font-size: 1.1rem;">{away}</div>
-                                {get_odds_badge(away_odds)}
-                            </div>
-                        </div>
-                    </div>
-                """, unsafe_allow_html=True)
-        else:
-            st.info("🎉 All matches completed! Schedule new matches in the Schedule section.")
+        st.info("""
+            ⚽ No matches played yet. 
+            Standings will appear here after the first fixtures.
+        """)
 
-        # --- Recent Results Section ---
-        st.header("📅 Recent Results", divider="green")
-        c.execute("SELECT home_player, away_player, home_goals, away_goals, round FROM matches WHERE home_goals IS NOT NULL ORDER BY id DESC LIMIT 5")
-        recent_matches = c.fetchall()
-        
-        if recent_matches:
-            for home, away, hg, ag, round_num in recent_matches:
-                result_color = "#2ecc71" if hg > ag else ("#e74c3c" if hg < ag else "#f1c40f")
-                st.markdown(f"""
-                    <div style="background-color: black; 
-                                padding: 1rem; 
-                                border-radius: 10px; 
-                                border: 1px solid #dee2e6;
-                                margin: 0.5rem 0;">
-                        <div style="display: flex; justify-content: space-between;color:white; align-items: center;">
-                            <div style="flex: 1; text-align: right; font-weight: bold;">{home}</div>
-                            <div style="flex: 0.5; text-align: center; 
-                                      font-size: 1.2rem; color: {result_color}; 
-                                      font-weight: bold;">
-                                {hg} - {ag}
-                            </div>
-                            <div style="flex: 1; text-align: left; font-weight: bold;">{away}</div>
-                        </div>
-                        <div style="text-align: center; color: white; margin-top: 0.5rem;">
-                            {round_num}
-                        </div>
-                    </div>
-                """, unsafe_allow_html=True)
-        else:
-            st.info("📭 No recent results to display")
-
-        # --- League Statistics Section ---
-        st.header("📈 League Statistics", divider="red")
-        col1, col2, col3 = st.columns(3)
-        # League Statistics
-        st.subheader("League Statistics")
-        c.execute("SELECT SUM(home_goals) + SUM(away_goals) FROM matches")
-        total_goals = c.fetchone()[0] or 0
-        c.execute("SELECT home_player, SUM(home_goals) FROM matches GROUP BY home_player ORDER BY SUM(home_goals) DESC LIMIT 1")
-        top_scorer = c.fetchone()
-        top_scorer_name = top_scorer[0] if top_scorer else "N/A"
-        top_scorer_goals = top_scorer[1] if top_scorer else 0
-        st.write(f"**Total Goals Scored:** {total_goals}")
-        st.write(f"**Top Scorer:** {top_scorer_name} with {top_scorer_goals} goals")
-        with col1:
-            st.markdown(f"""
-                <div style="background-color: #4b8bff; 
-                            padding: 1.5rem; 
-                            border-radius: 10px; 
-                            color: white;
-                            text-align: center;">
-                    <div style="font-size: 2rem;">⚽</div>
-                    <h3 style="margin: 0.5rem 0;">Total Goals</h3>
-                    <div style="font-size: 1.5rem; font-weight: bold;">{total_goals}</div>
-                </div>
-            """, unsafe_allow_html=True)
-        
-        with col2:
-            st.markdown(f"""
-                <div style="background-color: #2ecc71; 
-                            padding: 1.5rem; 
-                            border-radius: 10px; 
-                            color: white;
-                            text-align: center;">
-                    <div style="font-size: 2rem;">👑</div>
-                    <h3 style="margin: 0.5rem 0;">Top Scorer</h3>
-                    <div style="font-size: 1.1rem;">{top_scorer_name}</div>
-                    <div style="font-size: 1.3rem; font-weight: bold;">{top_scorer_goals} goals</div>
-                </div>
-            """, unsafe_allow_html=True)
-        
-        with col3:
-            total_matches = sum(1 for _ in c.execute("SELECT id FROM matches"))
-            completed_matches = sum(1 for _ in c.execute("SELECT id FROM matches WHERE home_goals IS NOT NULL"))
-            progress = completed_matches / total_matches if total_matches > 0 else 0
-            
-            st.markdown(f"""
-                <div style="background-color: #f1c40f; 
-                            padding: 1.5rem; 
-                            border-radius: 10px; 
-                            color: white;
-                            text-align: center;">
-                    <div style="font-size: 2rem;">📅</div>
-                    <h3 style="margin: 0.5rem 0;">League Progress</h3>
-                    <div style="font-size: 1.3rem; font-weight: bold;">
-                        {int(progress*100)}% Complete
-                    </div>
-                    <div style="color: rgba(255,255,255,0.8);">
-                        {completed_matches}/{total_matches} matches
-                    </div>
-                </div>
-            """, unsafe_allow_html=True)
-
-        # Custom CSS
-        st.markdown("""
-            <style>
-                [data-testid="stHeader"] {
-                    margin-bottom: -5rem;
-                }
-                .st-emotion-cache-1y4p8pa {
-                    padding-top: 2rem;
-                }
-                div[data-testid="column"] {
-                    padding: 0.5rem;
-                }
-            </style>
-        """, unsafe_allow_html=True)
 
-# Page 2: Player Registration
-elif page == "Player Registration":
-    st.title("Player Registration")
-    # Load existing players from DB
-    c.execute("SELECT name FROM players")
-    players = [row[0] for row in c.fetchall()]
-    new_player = st.text_input("Enter player name")
-    if st.button("Add Player") and new_player:
-        if new_player not in players and len(players) < 10:
-            c.execute("INSERT OR IGNORE INTO players (name) VALUES (?)", (new_player,))
-            conn.commit()
-            st.success(f"Added {new_player}")
-        elif new_player in players:
-            st.warning("Player name must be unique!")
-        else:
-            st.warning("Only 10 players allowed!")
+@st.fragment
+def season_outlook(league_id, season_id):
+    conn = db.get_connection()
+    version = standings.data_version(conn, league_id)
+    summary = standings.get_season_summary(conn, season_id, version, standings.schedule_version(conn, league_id))
+    # Without a schedule there is nothing to simulate
+    if summary["total_matches"] == 0:
+        return
+    st.header("🔮 Season Outlook", divider="violet")
+    if summary["pending_matches"] > simulation.MAX_PENDING:
+        st.info(f"The outlook appears once at most {simulation.MAX_PENDING:,} fixtures are left to play "
+                f"({summary['pending_matches']:,} now).")
+        return
+    with st.spinner("Simulating the rest of the season..."):
+        probabilities = simulation.get_position_probabilities(conn, season_id, version,
+                                                              leagues.load_tiebreakers(conn, league_id))
+    n = len(probabilities.columns)
+    if n < 2:
+        return
+    positions = probabilities.columns.to_numpy()
+    outlook = pd.DataFrame({
+        "Player": probabilities.index,
+        "Avg. Pos": probabilities.to_numpy() @ positions,
+        "Title": 100 * probabilities[1].to_numpy(),
+        f"Top {ranking.TOP_SPOTS}": 100 * probabilities.loc[:, :ranking.TOP_SPOTS].sum(axis=1).to_numpy(),
+    })
+    # Zones only make sense once the table is longer than both of them together
+    if n > ranking.TOP_SPOTS + ranking.RELEGATION_SPOTS:
+        outlook["Relegation"] = 100 * probabilities.loc[:, n - ranking.RELEGATION_SPOTS + 1:].sum(axis=1).to_numpy()
+    percent = st.column_config.ProgressColumn(min_value=0, max_value=100, format="%.1f%%")
+    st.dataframe(
+        outlook.sort_values("Avg. Pos"),
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            "Avg. Pos": st.column_config.NumberColumn(format="%.1f"),
+            **{col: percent for col in outlook.columns[2:]},
+        },
+    )
+    st.caption("Remaining fixtures played out thousands of times from each player's scoring and conceding "
+               "rates so far; ties on points split by goal difference, then goals scored.")
+    if n <= 40:
+        with st.expander("Every finishing position"):
+            st.dataframe((100 * probabilities).round(1), use_container_width=True)
 
-    # Display and remove players
-    if players:
-        st.write("Current Players:")
-        for i, player in enumerate(players):
-            col1, col2 = st.columns([3, 1])
-            col1.write(player)
-            if col2.button("Remove", key=f"remove_{i}"):
-                c.execute("DELETE FROM players WHERE name = ?", (player,))
-                c.execute("DELETE FROM matches WHERE home_player = ? OR away_player = ?", (player, player))
-                conn.commit()
-                st.rerun()
 
-    # Confirm players
-    if len(players) == 10:
-        if st.button("Confirm Players"):
-            st.session_state.confirmed = True
-            st.success("Players confirmed! Move to Match Schedule.")
-    else:
-        st.warning(f"Need exactly 10 players (currently {len(players)}).")
+@st.fragment
+def upcoming_matches(players, league_id, season_id):
+    conn = db.get_connection()
+    # Odds for every pending fixture come from one batched pass over the ratings
+    odds = ratings.get_match_odds(conn, season_id, standings.data_version(conn, league_id))
 
-elif page == "Match Schedule":
-    st.title("Match Schedule")
-    if not st.session_state.confirmed:
-        st.warning("Please register and confirm players first!")
+    # --- Upcoming Matches Section ---
+    st.header("⏩ Upcoming Matches", divider="orange")
+    upcoming = scheduling.load_upcoming(conn, season_id)
+
+    # Fixtures recorded or created since the odds were computed are skipped; the next rerun catches up
+    cards = [(players[home_id], players[away_id], round_num, kickoff, odds[match_id])
+             for match_id, home_id, away_id, round_num, kickoff in upcoming if match_id in odds]
+    if upcoming:
+        rendering.section(rendering.upcoming_cards(cards))
     else:
-        # Load players
-        c.execute("SELECT name FROM players")
-        players = [row[0] for row in c.fetchall()]
-        
-        # Generate schedule if not already in DB
-        c.execute("SELECT COUNT(*) FROM matches")
-        if c.fetchone()[0] == 0:
-            # Use a round-robin algorithm to create a double round robin schedule
-            n = len(players)
-            # If odd number of players, add a dummy "Bye" team (these matches will be skipped)
-            if n % 2 == 1:
-                players.append("Bye")
-                n += 1
-            
-            fixed = players[0]
-            rotating = players[1:]
-            rounds = []
-            # First half rounds: generate n-1 rounds
-            for r in range(n - 1):
-                teams_order = [fixed] + rotating
-                round_matches = []
-                for i in range(n // 2):
-                    home = teams_order[i]
-                    away = teams_order[-(i+1)]
-                    # Exclude matches involving "Bye"
-                    if home != "Bye" and away != "Bye":
-                        round_matches.append((home, away, f"Round {r+1}", "20:00", None, None))
-                rounds.append(round_matches)
-                # Rotate the teams (keep the first team fixed)
-                rotating = [rotating[-1]] + rotating[:-1]
-            
-            # Second half: mirror the matches (swap home and away) and assign subsequent round numbers
-            rounds2 = []
-            for r, round_matches in enumerate(rounds):
-                mirrored = []
-                for match in round_matches:
-                    home, away, _, time, _, _ = match
-                    mirrored.append((away, home, f"Round {r + n}", time, None, None))
-                rounds2.append(mirrored)
-            
-            full_rounds = rounds + rounds2
-            # Insert all rounds into the database
-            for round_matches in full_rounds:
-                c.executemany(
-                    "INSERT INTO matches (home_player, away_player, round, time, home_goals, away_goals) VALUES (?, ?, ?, ?, ?, ?)",
-                    round_matches
-                )
-            conn.commit()
+        st.info("🎉 All matches completed! Schedule new matches in the Schedule section.")
 
-        # Load and display schedule
-        c.execute("SELECT home_player, away_player, round, time, home_goals, away_goals FROM matches")
-        schedule = [
-            {
-                "Match": f"{row[0]} vs {row[1]}", 
-                "Round": row[2], 
-                "Time": row[3], 
-                "Result": (row[4], row[5]) if row[4] is not None else None
-            } 
-            for row in c.fetchall()
-        ]
-        
-        filtered_schedule = schedule
-        filter_player = st.selectbox("Filter by Player", ["All"] + players)
-        filter_round = st.selectbox("Filter by Round", ["All"] + sorted(set([m["Round"] for m in schedule])))
-        
-        if filter_player != "All":
-            filtered_schedule = [m for m in filtered_schedule if filter_player in m["Match"]]
-        if filter_round != "All":
-            filtered_schedule = [m for m in filtered_schedule if m["Round"] == filter_round]
-        st.table(filtered_schedule)
-
-        # Edit match time
-        match_to_edit = st.selectbox("Edit a match", [m["Match"] for m in schedule])
-        new_time = st.text_input("New Time (e.g., 20:00)", "20:00")
-        if st.button("Update Time"):
-            home, away = match_to_edit.split(" vs ")
-            c.execute(
-                "UPDATE matches SET time = ? WHERE home_player = ? AND away_player = ?",
-                (new_time, home, away)
-            )
-            conn.commit()
-            st.success(f"Updated time for {match_to_edit}")
-            st.rerun()
 
+@st.fragment
+def recent_results(players, season_id):
+    conn = db.get_connection()
+    # --- Recent Results Section ---
+    st.header("📅 Recent Results", divider="green")
+    recent_matches = scheduling.load_recent_results(conn, season_id)
 
-elif page == "League Classification":
-    st.title("🏆 League Classification")
-    
-    # Check if matches exist
-    c.execute("SELECT COUNT(*) FROM matches")
-    if c.fetchone()[0] == 0:
-        st.warning("Please generate the schedule first!")
+    if recent_matches:
+        rendering.section(rendering.result_cards(
+            (players[home_id], players[away_id], hg, ag, round_num) for home_id, away_id, hg, ag, round_num in recent_matches
+        ))
     else:
-        # Load players
-        c.execute("SELECT name FROM players")
-        players = [row[0] for row in c.fetchall()]
-        
-        # Get rounds with pending matches
-        c.execute("SELECT DISTINCT round FROM matches WHERE home_goals IS NULL AND away_goals IS NULL")
-        pending_rounds = [row[0] for row in c.fetchall()]
-        
-        if pending_rounds:
-            st.header("📥 Input Match Results")
-            selected_round = st.selectbox("Select Round to Input Scores", pending_rounds)
-            
-            # Load pending matches for the selected round
-            c.execute("""SELECT home_player, away_player 
-                       FROM matches 
-                       WHERE round = ? AND home_goals IS NULL AND away_goals IS NULL""", 
-                       (selected_round,))
-            pending_matches = [(row[0], row[1]) for row in c.fetchall()]
-            
-            if pending_matches:
-                st.subheader(f"Round {selected_round} Matches")
-                for home, away in pending_matches:
+        st.info("📭 No recent results to display")
+
+
+@st.fragment
+def league_statistics(league_id, season_id):
+    conn = db.get_connection()
+    # --- League Statistics Section ---
+    st.header("📈 League Statistics", divider="red")
+    version = standings.data_version(conn, league_id)
+    summary = standings.get_season_summary(conn, season_id, version, standings.schedule_version(conn, league_id))
+    stats = player_stats.get_player_stats(conn, season_id, version)
+    total_goals = summary["total_goals"]
+    top_scorer_name, top_scorer_goals = player_stats.top_scorer(stats)
+    top_scorer_name = top_scorer_name or "N/A"
+    if summary["next_round"] is not None:
+        next_up = (f"Round {summary['next_round']} up next · "
+                   f"next kickoff {scheduling.format_kickoff(summary['next_kickoff'])}")
+    else:
+        next_up = "Season complete"
+    rendering.section(rendering.stat_cards([
+        ("goals", "⚽", "Total Goals", total_goals, ()),
+        ("scorer", "👑", "Top Scorer", f"{top_scorer_goals} goals", (top_scorer_name,)),
+        ("progress", "📅", "League Progress", f"{int(summary['progress'] * 100)}% Complete",
+         (f"{summary['completed_matches']}/{summary['total_matches']} matches", next_up)),
+    ]))
+    # League Statistics
+    st.subheader("League Statistics")
+    st.write(f"**Total Goals Scored:** {total_goals}")
+    st.write(f"**Top Scorer:** {top_scorer_name} with {top_scorer_goals} goals")
+
+    st.subheader("Player Statistics")
+    st.dataframe(
+        stats.sort_values(["goals_for", "goals_against"], ascending=[False, True]),
+        use_container_width=True,
+        column_config={
+            "played": "MP", "wins": "W", "draws": "D", "losses": "L",
+            "goals_for": "Goals For", "goals_against": "Goals Against", "clean_sheets": "Clean Sheets",
+            "biggest_win": "Biggest Win", "current_streak": "Streak",
+            "longest_win_streak": "Longest Win Run", "longest_unbeaten": "Longest Unbeaten",
+            "form": st.column_config.TextColumn("Form", help="Last 5 results, most recent last"),
+        },
+    )
+
+
+@st.fragment
+def score_entry(players, season_id):
+    conn = db.get_connection()
+    c = conn.cursor()
+    # Get rounds with pending matches
+    c.execute("SELECT DISTINCT round FROM matches WHERE season_id = ? AND home_goals IS NULL AND away_goals IS NULL ORDER BY round",
+              (season_id,))
+    pending_rounds = [row[0] for row in c.fetchall()]
+
+    if pending_rounds:
+        st.header("📥 Input Match Results")
+        selected_round = st.selectbox("Select Round to Input Scores", pending_rounds, format_func="Round {}".format)
+
+        # Load pending matches for the selected round
+        c.execute("""SELECT id, home_id, away_id 
+                   FROM matches 
+                   WHERE season_id = ? AND round = ? AND home_goals IS NULL AND away_goals IS NULL""", 
+                   (season_id, selected_round))
+        pending_matches = [(row[0], row[1], row[2]) for row in c.fetchall()]
+
+        def record_scores(submission):
+            """Save a round's scores in one transaction, skipping fixtures already filled in.
+
+            The scores go out in one batched update and are logged as result events;
+            ratings and snapshots then catch up from the log. Returns how many were saved.
+            """
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                recorded = events.record_results(
+                    conn, [(score["home_goals"], score["away_goals"], score["id"]) for score in submission],
+                    submission[0].get("entered_by"))
+            events.process(conn, season_id)
+            return len(recorded)
+
+        if pending_matches:
+            st.subheader(f"Round {selected_round} Matches")
+            # One form per round: changing a score doesn't rerun the page, and the
+            # whole round is saved by a single submit
+            with st.form(f"scores_{season_id}_{selected_round}"):
+                scores = []
+                for match_id, home_id, away_id in pending_matches:
+                    home, away = players[home_id], players[away_id]
                     # Create a styled container for each match
                     st.markdown(f"""
                         <div style="background-color: #f8f9fa; 
@@ -474,7 +243,7 @@ elif page == "League Classification":
                                 ⚽ {home} vs {away}
                             </div>
                     """, unsafe_allow_html=True)
-                    
+
                     cols = st.columns([2, 1, 2])
                     with cols[0]:
                         st.markdown(f"**{home}** (Home)")
@@ -483,248 +252,437 @@ elif page == "League Classification":
                                   unsafe_allow_html=True)
                     with cols[2]:
                         st.markdown(f"**{away}** (Away)")
-                    
+
+                    # Left empty for fixtures that haven't been played yet
                     col1, col2 = st.columns(2)
                     with col1:
                         home_goals = st.number_input(
                             f"Goals for {home}", 
                             min_value=0, 
                             step=1, 
-                            key=f"{home}_{away}_home"
+                            value=None,
+                            key=f"home_goals_{match_id}"
                         )
                     with col2:
                         away_goals = st.number_input(
                             f"Goals for {away}", 
                             min_value=0, 
                             step=1, 
-                            key=f"{home}_{away}_away"
+                            value=None,
+                            key=f"away_goals_{match_id}"
                         )
-                    
-                    if st.button("Submit Score", key=f"submit_{home}_{away}"):
-                        if st.session_state.get("password_verified", False):
-                            c.execute(
-                                """UPDATE matches 
-                                SET home_goals = ?, away_goals = ? 
-                                WHERE home_player = ? AND away_player = ? AND round = ?""",
-                                (home_goals, away_goals, home, away, selected_round)
-                            )
-                            conn.commit()
-                            st.success(f"✅ Result recorded: {home} {home_goals} - {away_goals} {away}")
-                            st.rerun()
-                        else:
-                            st.session_state.pending_submission = {
-                                "home": home,
-                                "away": away,
-                                "round": selected_round,
-                                "home_goals": home_goals,
-                                "away_goals": away_goals
-                            }
-                            st.session_state.show_password = True
-                            st.rerun()
                     st.markdown("</div>", unsafe_allow_html=True)
-                
-                # Password verification section
-                if st.session_state.get("show_password", False):
-                    password = st.text_input("Enter Admin Password", type="password", key="admin_pwd")
-                    if password:
-                        if password == "admin":
-                            st.session_state.password_verified = True
-                            st.session_state.show_password = False
-                            submission = st.session_state.pending_submission
-                            c.execute(
-                                """UPDATE matches 
-                                SET home_goals = ?, away_goals = ? 
-                                WHERE home_player = ? AND away_player = ? AND round = ?""",
-                                (submission["home_goals"], submission["away_goals"], 
-                                 submission["home"], submission["away"], submission["round"])
-                            )
-                            conn.commit()
-                            st.success(f"✅ Result recorded: {submission['home']} {submission['home_goals']} - {submission['away_goals']} {submission['away']}")
+                    if home_goals is not None and away_goals is not None:
+                        scores.append({
+                            "id": match_id,
+                            "home_id": home_id,
+                            "away_id": away_id,
+                            "home_goals": home_goals,
+                            "away_goals": away_goals
+                        })
+                entered_by = st.text_input("Entered by", key="entered_by")
+                submitted = st.form_submit_button("Submit Round Scores")
+                for score in scores:
+                    score["entered_by"] = entered_by or None
+
+            if submitted:
+                if not scores:
+                    st.warning("Enter both scores for at least one match.")
+                elif st.session_state.get("password_verified", False):
+                    recorded = record_scores(scores)
+                    st.success(f"✅ Recorded {recorded} result(s) for Round {selected_round}")
+                    st.rerun()
+                else:
+                    st.session_state.pending_submission = scores
+                    st.session_state.show_password = True
+                    st.rerun()
+
+            # Password verification section
+            if st.session_state.get("show_password", False):
+                password = st.text_input("Enter Admin Password", type="password", key="admin_pwd")
+                if password:
+                    if password == "admin":
+                        st.session_state.password_verified = True
+                        st.session_state.show_password = False
+                        submission = st.session_state.pending_submission
+                        recorded = record_scores(submission)
+                        st.success(f"✅ Recorded {recorded} result(s)")
+                        del st.session_state.pending_submission
+                        st.rerun()
+                    else:
+                        st.error("Incorrect password. Please try again.")
+                        if "pending_submission" in st.session_state:
                             del st.session_state.pending_submission
-                            st.rerun()
-                        else:
-                            st.error("Incorrect password. Please try again.")
-                            if "pending_submission" in st.session_state:
-                                del st.session_state.pending_submission
-                            st.session_state.show_password = False
-                            st.rerun()
-            else:
-                st.info(f"All matches in Round {selected_round} have been completed!")
+                        st.session_state.show_password = False
+                        st.rerun()
         else:
-            st.success("🎉 All rounds have been completed!")
+            st.info(f"All matches in Round {selected_round} have been completed!")
+    else:
+        st.success("🎉 All rounds have been completed!")
 
-        # Enhanced standings calculation
-        st.header("📊 Current Standings")
-        standings = {p: {"Points": 0, "GD": 0, "Matches Played": 0, 
-                       "Wins": 0, "Draws": 0, "Losses": 0, 
-                       "Goals For": 0, "Goals Against": 0} for p in players}
-        
-        c.execute("SELECT home_player, away_player, home_goals, away_goals FROM matches WHERE home_goals IS NOT NULL")
-        for home, away, home_goals, away_goals in c.fetchall():
-            # Update standings logic remains the same
-            # ... (same as original code)
-            standings[home]["Matches Played"] += 1
-            standings[away]["Matches Played"] += 1
-            standings[home]["Goals For"] += home_goals
-            standings[away]["Goals For"] += away_goals
-            standings[home]["Goals Against"] += away_goals
-            standings[away]["Goals Against"] += home_goals
-            standings[home]["GD"] += home_goals - away_goals
-            standings[away]["GD"] += away_goals - home_goals
-            if home_goals > away_goals:
-                standings[home]["Points"] += 3
-                standings[home]["Wins"] += 1
-                standings[away]["Losses"] += 1
-            elif home_goals < away_goals:
-                standings[away]["Points"] += 3
-                standings[away]["Wins"] += 1
-                standings[home]["Losses"] += 1
+
+@st.fragment
+def result_log(players, season_id):
+    conn = db.get_connection()
+    # Every result, correction, void and kickoff change is kept in match_events
+    with st.expander("✏️ Correct or void a result"):
+        if not st.session_state.get("password_verified", False):
+            st.info("Enter the admin password with a round's scores to unlock corrections.")
+        else:
+            played = conn.execute("""SELECT id, home_id, away_id, round, home_goals, away_goals FROM matches
+                                     WHERE season_id = ? AND home_goals IS NOT NULL ORDER BY round DESC, id""",
+                                  (season_id,)).fetchall()
+            if not played:
+                st.info("No results recorded yet.")
             else:
-                standings[home]["Points"] += 1
-                standings[away]["Points"] += 1
-                standings[home]["Draws"] += 1
-                standings[away]["Draws"] += 1
-
-        # Sort and display enhanced leaderboard
-        leaderboard = sorted(standings.items(), key=lambda x: (-x[1]["Points"], -x[1]["GD"]))
-
-        # Create styled DataFrame
-        leaderboard_data = []
-        for idx, (p, s) in enumerate(leaderboard):
-            emoji = ""
-            if idx == 0:
-                emoji = "🥇"
-            elif idx == 1:
-                emoji = "🥈"
-            elif idx == 2:
-                emoji = "🥉"
-                
-            leaderboard_data.append({
-                "Position": f"{idx+1}{emoji}",
-                "Player": p,
-                "Pts": s["Points"],
-                "GD": s["GD"],
-                "MP": s["Matches Played"],
-                "W": s["Wins"],
-                "D": s["Draws"],
-                "L": s["Losses"],
-                "GF": s["Goals For"],
-                "GA": s["Goals Against"]
-            })
-
-        # Create and style DataFrame
-        df = pd.DataFrame(leaderboard_data)
-        df = df[["Position", "Player", "Pts", "GD", "MP", "W", "D", "L", "GF", "GA"]]
-
-        # Define functions for conditional formatting
-        def highlight_top_bottom(row):
-            """Highlight top and bottom positions with green and red colors."""
-            position = int(row["Position"].replace("🥇", "").replace("🥈", "").replace("🥉", ""))
-            styles = ["background-color: transparent"] * len(row)
-            
-            # Highlight top 4 positions (e.g., Champions League spots)
-            if position <= 4:
-                styles = ["background-color: #e8f5e9"] * len(row)  # Light green
-                
-            # Highlight bottom 3 positions (e.g., relegation zone)
-            elif position >= len(leaderboard_data) - 2:
-                styles = ["background-color: #ffebee"] * len(row)  # Light red
-                
-            return styles
-
-        # Apply Premier League-inspired styling
-        styled_df = df.style \
-            .hide(axis='index') \
-            .format({
-                "GD": "{:+}",
-                "Pts": "{:d}",
-                "MP": "{:d}",
-                "W": "{:d}",
-                "D": "{:d}",
-                "L": "{:d}",
-                "GF": "{:d}",
-                "GA": "{:d}"
-            }) \
-            .apply(highlight_top_bottom, axis=1) \
-            .applymap(lambda x: 'font-weight: bold;', subset=["Player"]) \
-            .apply(lambda x: ['background-color: #f8f9fa' if i%2==0 else 'background-color: white' for i in range(len(x))]) \
-            .set_properties(**{
-                'text-align': 'center',
-                'font-size': '14px',
-                'border': '1px solid #dee2e6'
-            }, subset=["Pts", "GD", "MP", "W", "D", "L", "GF", "GA"]) \
-            .set_properties(**{
-                'text-align': 'left',
-                'padding-left': '12px'
-            }, subset=["Player"]) \
-            .set_table_styles([{
-                'selector': 'th',
-                'props': [
-                    ('background-color', '#37003c'),  # Premier League purple
-                    ('color', 'white'),
-                    ('font-weight', 'bold'),
-                    ('font-size', '15px'),
-                    ('text-align', 'center'),
-                    ('border', '0px solid #dee2e6')
-                ]
-            }, {
-                'selector': 'td',
-                'props': [
-                    ('border', '1px solid #dee2e6'),
-                    ('padding', '8px')
-                ]
-            }, {
-                'selector': 'tr:hover',
-                'props': [
-                    ('background-color', '#f1f3f5')
-                ]
-            }])
+                by_id = {row[0]: row for row in played}
+                with st.form("correct_result"):
+                    match_id = st.selectbox(
+                        "Match", list(by_id),
+                        format_func=lambda i: (f"Round {by_id[i][3]}: {players[by_id[i][1]]} {by_id[i][4]} - "
+                                               f"{by_id[i][5]} {players[by_id[i][2]]}"))
+                    col1, col2 = st.columns(2)
+                    home_goals = col1.number_input("Home goals", min_value=0, step=1)
+                    away_goals = col2.number_input("Away goals", min_value=0, step=1)
+                    entered_by = st.text_input("Entered by")
+                    col1, col2 = st.columns(2)
+                    correct = col1.form_submit_button("Correct Result")
+                    void = col2.form_submit_button("Void Result")
+                if correct or void:
+                    with conn:
+                        if correct:
+                            events.correct_result(conn, match_id, home_goals, away_goals, entered_by or None)
+                        else:
+                            events.void_result(conn, match_id, entered_by or None)
+                    # Ratings and snapshots replay the season from the corrected results
+                    events.process(conn, season_id)
+                    st.rerun()
+    with st.expander("📜 Result log"):
+        mismatches = events.audit(conn, season_id)
+        if mismatches:
+            st.warning(f"{len(mismatches)} stored result(s) differ from the log.")
+            # Restoring rewrites results, so it is an admin action like corrections
+            if not st.session_state.get("password_verified", False):
+                st.info("Enter the admin password with a round's scores to restore them.")
+            elif st.button("Restore Results From Log"):
+                events.rebuild_from_log(conn, season_id)
+                st.rerun()
+        st.dataframe(events.load_history(conn, season_id), use_container_width=True, hide_index=True)
+
+
+@st.fragment
+def standings_table(league_id, season_id):
+    conn = db.get_connection()
+    # Enhanced standings calculation
+    st.header("📊 Current Standings")
+    # Sort and display enhanced leaderboard
+    tiebreakers = leagues.load_tiebreakers(conn, league_id)
+    table = rendering.get_classification(conn, season_id, standings.data_version(conn, league_id),
+                                         tiebreakers=tiebreakers)
+    st.dataframe(
+        table,
+        use_container_width=True,
+        height=(len(table) + 1) * 38 + 3,
+        column_config=rendering.CLASSIFICATION_COLUMNS,
+        hide_index=True,
+    )
+    st.caption("Level on points: " + " → ".join(ranking.TIEBREAKERS[name] for name in tiebreakers)
+               if tiebreakers else "Level on points: registration order")
+    st.caption(f"{rendering.TOP_ZONE} Top {ranking.TOP_SPOTS} · {rendering.RELEGATION_ZONE} "
+               f"Relegation (bottom {ranking.RELEGATION_SPOTS})")
+    st.markdown("""
+        <style>
+            [data-testid="stDataFrame"] {
+                border: 0px solid #37003c;
+                border-radius: 12px;
+                box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+            }
+            [data-testid="stDataFrame"] table {
+                width: 100%;
+                border-collapse: collapse;
+            }
+            [data-testid="stDataFrame"] th {
+                border-bottom: 2px solid #dee2e6 !important;
+            }
+            [data-testid="stDataFrame"] tr:first-child td {
+                background-color: #e8d4ff !important;
+                font-weight: bold !important;
+            }
+            [data-testid="stDataFrame"] tr:nth-child(2) td {
+                background-color: #f3e9ff !important;
+            }
+            [data-testid="stDataFrame"] tr:nth-child(3) td {
+                background-color: #f8f2ff !important;
+            }
+            [data-testid="stDataFrame"] tr td {
+                transition: background-color 0.2s ease;
+            }
+        </style>
+    """, unsafe_allow_html=True)
+
+
+@st.fragment
+def table_history(league_id, season_id):
+    conn = db.get_connection()
+    history = snapshots.get_position_history(conn, season_id, standings.data_version(conn, league_id),
+                                             leagues.load_tiebreakers(conn, league_id))
+    if history.empty:
+        return
+    st.header("📈 Table History")
+    rounds = list(history.index)
+    round_number = rounds[0]
+    if len(rounds) > 1:
+        round_number = st.select_slider("Table after round", rounds, value=rounds[-1])
+    players = standings.load_season_players(conn, season_id)
+    st.dataframe(
+        pd.DataFrame(
+            [(position, players[player_id], *stats)
+             for player_id, position, *stats in snapshots.table_at_round(conn, season_id, round_number)],
+            columns=["Pos", "Player", "Pts", "GD", "MP", "W", "D", "L", "GF", "GA"],
+        ),
+        hide_index=True,
+        use_container_width=True,
+    )
+    # Latest table order, so the default selection is the current top of the table
+    by_position = list(history.loc[rounds[-1]].sort_values().index)
+    shown = st.multiselect("Position over time", by_position, default=by_position[:8])
+    if shown:
+        st.pyplot(snapshots.position_chart(history, shown))
+
+
+# Initialize session state: ids of the leagues whose roster this session confirmed
+if 'confirmed' not in st.session_state:
+    st.session_state.confirmed = set()
+
+# Sidebar: league and season selection, then navigation with Dashboard as the default
+sidebar_title = st.sidebar.empty()
+all_leagues = {league_id: (name, roster_size) for league_id, name, roster_size in leagues.load_leagues(conn)}
+league_id = st.sidebar.selectbox("League", list(all_leagues), format_func=lambda i: all_leagues[i][0])
+league_name, roster_size = all_leagues[league_id]
+seasons = dict(leagues.load_seasons(conn, league_id))
+season_id = st.sidebar.selectbox("Season", list(seasons), format_func=seasons.get)
+sidebar_title.title(league_name)
+page = st.sidebar.radio("Go to", ["Dashboard", "Player Registration", "Match Schedule", "League Classification"])
+
+with st.sidebar.expander("➕ New league or season"):
+    with st.form("new_league", clear_on_submit=True):
+        new_league = st.text_input("League name")
+        new_roster_size = st.number_input("Roster size", min_value=2, max_value=leagues.MAX_ROSTER_SIZE, value=10, step=1)
+        first_season = st.text_input("First season", "Season 1")
+        if st.form_submit_button("Create League") and new_league:
+            try:
+                leagues.create_league(conn, new_league, int(new_roster_size), first_season or "Season 1")
+                st.rerun()
+            except sqlite3.IntegrityError:
+                st.warning("League name must be unique!")
+    with st.form("new_season", clear_on_submit=True):
+        new_season = st.text_input(f"New season of {league_name}")
+        if st.form_submit_button("Start Season") and new_season:
+            try:
+                leagues.create_season(conn, league_id, new_season)
+                st.rerun()
+            except sqlite3.IntegrityError:
+                st.warning("Season name must be unique!")
+
+with st.sidebar.expander("⚖️ Tiebreakers"):
+    # Applied in order to players level on points; head-to-head only counts games among them
+    with st.form("tiebreakers"):
+        chain = st.multiselect("Separate players level on points by", list(ranking.TIEBREAKERS),
+                               default=list(leagues.load_tiebreakers(conn, league_id)),
+                               format_func=ranking.TIEBREAKERS.get)
+        if st.form_submit_button("Save Tiebreakers"):
+            leagues.set_tiebreakers(conn, league_id, chain)
+            # Historical positions were ranked with the old chain
+            for season in seasons:
+                snapshots.rebuild_snapshots(conn, season)
+            st.rerun()
+
+# Page 1: Dashboard (New Main Page)
+if page == "Dashboard":
+    st.title("📊 League Dashboard")
+    
+    # Load players (id -> name)
+    players = standings.load_players(conn, league_id)
+
+    if not players:
+        st.warning("⚠️ No players registered yet. Go to Player Registration to start.")
+    else:
+        # Card styles go out once; every section below only references their classes
+        rendering.inject_css()
+        if st.sidebar.toggle("🔴 Live updates", value=True, help="Refresh when new results come in"):
+            # Full runs record the version they rendered; the watcher fragment compares against it
+            st.session_state.live_version = (standings.data_version(conn, league_id),
+                                             standings.schedule_version(conn, league_id))
+            live_updates(league_id)
+        standings_cards(league_id, season_id)
+        season_outlook(league_id, season_id)
+        upcoming_matches(players, league_id, season_id)
+        recent_results(players, season_id)
+        league_statistics(league_id, season_id)
+
+# Page 2: Player Registration
+elif page == "Player Registration":
+    st.title("Player Registration")
+    # Load existing players from DB
+    players = standings.load_players(conn, league_id)
+    new_player = st.text_input("Enter player name")
+    if st.button("Add Player") and new_player:
+        if new_player not in players.values() and len(players) < roster_size:
+            c.execute("INSERT OR IGNORE INTO players (league_id, name) VALUES (?, ?)", (league_id, new_player))
+            conn.commit()
+            st.success(f"Added {new_player}")
+        elif new_player in players.values():
+            st.warning("Player name must be unique!")
+        else:
+            st.warning(f"Only {roster_size} players allowed!")
+
+    # Display and remove players; a single picker scales to rosters of hundreds
+    if players:
+        st.write("Current Players:")
+        st.dataframe({"Player": list(players.values())}, hide_index=True, use_container_width=True)
+        col1, col2 = st.columns([3, 1])
+        player_to_remove = col1.selectbox("Player to remove", list(players), format_func=players.get)
+        if col2.button("Remove"):
+            # Their fixtures and standings rows are removed by ON DELETE CASCADE
+            c.execute("DELETE FROM players WHERE id = ?", (player_to_remove,))
+            conn.commit()
+            st.rerun()
+
+    # Confirm players
+    if len(players) == roster_size:
+        if st.button("Confirm Players"):
+            st.session_state.confirmed.add(league_id)
+            st.success("Players confirmed! Move to Match Schedule.")
+    else:
+        st.warning(f"Need exactly {roster_size} players (currently {len(players)}).")
+
+elif page == "Match Schedule":
+    st.title("Match Schedule")
+    if league_id not in st.session_state.confirmed:
+        st.warning("Please register and confirm players first!")
+    else:
+        # Load players (id -> name)
+        players = standings.load_players(conn, league_id)
+
+        # Generate schedule if not already in DB
+        summary = standings.get_season_summary(conn, season_id, standings.data_version(conn, league_id),
+                                               standings.schedule_version(conn, league_id))
+        if summary["total_matches"] == 0:
+            with st.form("generate_schedule"):
+                legs = st.radio("Format", [2, 1], horizontal=True,
+                                format_func={2: "Double round robin", 1: "Single round robin"}.get)
+                balanced = st.checkbox("Balance home and away games (at most two in a row)", value=True)
+                slots = slot_settings()
+                generate = st.form_submit_button("Generate Schedule")
+            if generate:
+                fixtures = scheduling.allocate_kickoffs(
+                    scheduling.generate_fixtures(list(players), legs, balanced), **slots
+                )
+                with conn:
+                    conn.executemany(
+                        "INSERT INTO matches (season_id, home_id, away_id, round, kickoff) VALUES (?, ?, ?, ?, ?)",
+                        [(season_id, f.home, f.away, f.round, f.kickoff.isoformat(timespec="minutes")) for f in fixtures]
+                    )
+                st.rerun()
+
+        # Filters and pages are resolved in SQL; only the fixtures on screen are read
+        col1, col2 = st.columns(2)
+        filter_player = col1.selectbox("Filter by Player", [None] + list(players),
+                                       format_func=lambda p: "All" if p is None else players[p])
+        filter_round = col2.selectbox("Filter by Round", [None] + scheduling.load_rounds(conn, season_id),
+                                      format_func=lambda r: "All" if r is None else f"Round {r}")
+        # Start cursors of the pages visited so far, reset whenever the filters change
+        view = (season_id, filter_player, filter_round)
+        if st.session_state.get("schedule_view") != view:
+            st.session_state.schedule_view = view
+            st.session_state.schedule_pages = [None]
+        pages = st.session_state.schedule_pages
+        page_rows = scheduling.load_schedule_page(conn, season_id, filter_player, filter_round, after=pages[-1],
+                                                  limit=scheduling.SCHEDULE_PAGE_SIZE + 1)
+        has_next = len(page_rows) > scheduling.SCHEDULE_PAGE_SIZE
+        page_rows = page_rows[:scheduling.SCHEDULE_PAGE_SIZE]
+        schedule = [
+            {
+                "id": row[0],
+                "home_id": row[1],
+                "away_id": row[2],
+                "Match": f"{players[row[1]]} vs {players[row[2]]}",
+                "Round": row[3],
+                "Kickoff": row[4],
+                "Result": f"{row[5]} - {row[6]}" if row[5] is not None else None
+            }
+            for row in page_rows
+        ]
         st.dataframe(
-            styled_df,
-            use_container_width=True,
-            height=(len(leaderboard_data) + 1) * 38 + 3,
-            column_config={
-                "Position": st.column_config.TextColumn("Pos", width="small"),
-                "Player": st.column_config.TextColumn("Player", width="large"),
-                "Pts": st.column_config.NumberColumn("Pts", width="small"),
-                "GD": st.column_config.NumberColumn("GD", width="small"),
-                "MP": st.column_config.NumberColumn("MP", width="small"),
-                "W": st.column_config.NumberColumn("W", width="small"),
-                "D": st.column_config.NumberColumn("D", width="small"),
-                "L": st.column_config.NumberColumn("L", width="small"),
-                "GF": st.column_config.NumberColumn("GF", width="small"),
-                "GA": st.column_config.NumberColumn("GA", width="small")
-            },
-            hide_index=True
+            [{"Match": m["Match"], "Round": m["Round"], "Kickoff": scheduling.format_kickoff(m["Kickoff"]),
+              "Result": m["Result"]} for m in schedule],
+            use_container_width=True, hide_index=True,
         )
-        st.markdown("""
-            <style>
-                [data-testid="stDataFrame"] {
-                    border: 0px solid #37003c;
-                    border-radius: 12px;
-                    box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-                }
-                [data-testid="stDataFrame"] table {
-                    width: 100%;
-                    border-collapse: collapse;
-                }
-                [data-testid="stDataFrame"] th {
-                    border-bottom: 2px solid #dee2e6 !important;
-                }
-                [data-testid="stDataFrame"] tr:first-child td {
-                    background-color: #e8d4ff !important;
-                    font-weight: bold !important;
-                }
-                [data-testid="stDataFrame"] tr:nth-child(2) td {
-                    background-color: #f3e9ff !important;
-                }
-                [data-testid="stDataFrame"] tr:nth-child(3) td {
-                    background-color: #f8f2ff !important;
-                }
-                [data-testid="stDataFrame"] tr td {
-                    transition: background-color 0.2s ease;
-                }
-            </style>
-        """, unsafe_allow_html=True)
+        col1, col2, col3 = st.columns([1, 2, 1])
+        if col1.button("← Previous", disabled=len(pages) == 1):
+            pages.pop()
+            st.rerun()
+        col2.caption(f"Page {len(pages)}")
+        if col3.button("Next →", disabled=not has_next):
+            pages.append((schedule[-1]["Round"], schedule[-1]["id"]))
+            st.rerun()
+
+        # Edit one match's kickoff
+        if schedule:
+            matches_by_id = {m["id"]: m for m in schedule}
+            match_to_edit = st.selectbox("Edit a match", list(matches_by_id),
+                                         format_func=lambda i: f"Round {matches_by_id[i]['Round']}: {matches_by_id[i]['Match']}")
+            current = matches_by_id[match_to_edit]["Kickoff"]
+            current = datetime.fromisoformat(current) if current else datetime.combine(date.today(), scheduling.DEFAULT_KICKOFF)
+            col1, col2 = st.columns(2)
+            new_date = col1.date_input("New date", current.date(), key=f"kickoff_date_{match_to_edit}")
+            new_time = col2.time_input("New time", current.time(), key=f"kickoff_time_{match_to_edit}")
+            if st.button("Update Kickoff"):
+                with conn:
+                    events.change_kickoffs(
+                        conn, [(datetime.combine(new_date, new_time).isoformat(timespec="minutes"), match_to_edit)]
+                    )
+                st.success(f"Updated kickoff for {matches_by_id[match_to_edit]['Match']}")
+                st.rerun()
+
+        # Re-plan every unplayed fixture, e.g. after a missed night or a new console
+        if summary["pending_matches"]:
+            with st.expander("🗓️ Reallocate kickoffs"):
+                with st.form("reallocate_kickoffs"):
+                    slots = slot_settings()
+                    reallocate = st.form_submit_button("Reallocate Unplayed Fixtures")
+                if reallocate:
+                    pending = conn.execute("""SELECT id, round, home_id, away_id FROM matches
+                                              WHERE season_id = ? AND home_goals IS NULL ORDER BY round, id""",
+                                           (season_id,)).fetchall()
+                    fixtures = scheduling.allocate_kickoffs(
+                        [scheduling.Fixture(round_num, home, away, None) for _, round_num, home, away in pending], **slots
+                    )
+                    with conn:
+                        events.change_kickoffs(
+                            conn, [(f.kickoff.isoformat(timespec="minutes"), m[0]) for f, m in zip(fixtures, pending)]
+                        )
+                    st.rerun()
+
+
+elif page == "League Classification":
+    st.title("🏆 League Classification")
+    
+    # Check if matches exist
+    summary = standings.get_season_summary(conn, season_id, standings.data_version(conn, league_id),
+                                           standings.schedule_version(conn, league_id))
+    if summary["total_matches"] == 0:
+        st.warning("Please generate the schedule first!")
+    else:
+        # Load players (id -> name)
+        players = standings.load_players(conn, league_id)
+        
+        score_entry(players, season_id)
+        result_log(players, season_id)
+
+        standings_table(league_id, season_id)
+
+        table_history(league_id, season_id)
+
 
 # Page 5: Betting Odds (New Page)
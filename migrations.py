@@ -0,0 +1,505 @@
+# Numbered schema migrations, applied in order by db.migrate(). The database's
+# PRAGMA user_version holds how many have run. Never edit a released migration:
+# append a new one instead, since existing databases will not re-run it.
+
+
+def standings_delta(row, sign, home="home_player", away="away_player", key="player", season=False):
+    """SQL applying (sign=+1) or reverting (sign=-1) a played match row to the standings."""
+    statements = []
+    for player, gf, ga in ((home, "home_goals", "away_goals"), (away, "away_goals", "home_goals")):
+        scope = f"season_id = {row}.season_id AND " if season else ""
+        gf, ga = f"{row}.{gf}", f"{row}.{ga}"
+        statements.append(f"""UPDATE standings SET
+            points = points + {sign} * (3 * ({gf} > {ga}) + ({gf} = {ga})),
+            gd = gd + {sign} * ({gf} - {ga}),
+            played = played + {sign},
+            wins = wins + {sign} * ({gf} > {ga}),
+            draws = draws + {sign} * ({gf} = {ga}),
+            losses = losses + {sign} * ({gf} < {ga}),
+            goals_for = goals_for + {sign} * {gf},
+            goals_against = goals_against + {sign} * {ga}
+        WHERE {scope}{key} = {row}.{player} AND {row}.home_goals IS NOT NULL AND {row}.away_goals IS NOT NULL;""")
+    return "\n".join(statements)
+
+
+def bump_league(league_id):
+    """SQL bumping a league's data version, the cache key of everything derived from it."""
+    return f"UPDATE leagues SET data_version = data_version + 1 WHERE id = {league_id};"
+
+
+def season_match_triggers():
+    """SQL creating the triggers that keep season standings and league versions in step with matches."""
+    return f'''
+    CREATE TRIGGER standings_match_insert AFTER INSERT ON matches BEGIN
+        {standings_delta("NEW", 1, "home_id", "away_id", "player_id", season=True)}
+        {bump_league("(SELECT league_id FROM seasons WHERE id = NEW.season_id)")}
+    END;
+    CREATE TRIGGER standings_match_update
+    AFTER UPDATE OF season_id, home_id, away_id, home_goals, away_goals ON matches BEGIN
+        {standings_delta("OLD", -1, "home_id", "away_id", "player_id", season=True)}
+        {standings_delta("NEW", 1, "home_id", "away_id", "player_id", season=True)}
+        {bump_league("(SELECT league_id FROM seasons WHERE id = OLD.season_id)")}
+        {bump_league("(SELECT league_id FROM seasons WHERE id = NEW.season_id)")}
+    END;
+    CREATE TRIGGER standings_match_delete AFTER DELETE ON matches BEGIN
+        {standings_delta("OLD", -1, "home_id", "away_id", "player_id", season=True)}
+        {bump_league("(SELECT league_id FROM seasons WHERE id = OLD.season_id)")}
+    END;
+    '''
+
+
+BUMP_VERSION = "UPDATE data_version SET version = version + 1 WHERE id = 1;"
+
+MIGRATIONS = [
+    # 1: original tables (already present in databases created before migrations existed)
+    '''
+    CREATE TABLE IF NOT EXISTS players (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT UNIQUE
+    );
+    CREATE TABLE IF NOT EXISTS matches (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        home_player TEXT,
+        away_player TEXT,
+        round TEXT,
+        time TEXT,
+        home_goals INTEGER,
+        away_goals INTEGER,
+        FOREIGN KEY (home_player) REFERENCES players (name),
+        FOREIGN KEY (away_player) REFERENCES players (name)
+    );
+    ''',
+    # 2: indexes behind the matches lookups: pending fixtures per round, latest
+    # results, and the player pair used by score/time updates and player removal
+    '''
+    CREATE INDEX IF NOT EXISTS idx_matches_pending ON matches (round) WHERE home_goals IS NULL;
+    CREATE INDEX IF NOT EXISTS idx_matches_played ON matches (id) WHERE home_goals IS NOT NULL;
+    CREATE INDEX IF NOT EXISTS idx_matches_pair ON matches (home_player, away_player);
+    CREATE INDEX IF NOT EXISTS idx_matches_away ON matches (away_player);
+    ''',
+    # 3: trigger-maintained standings and the data version counter used as a cache key
+    f'''
+    CREATE TABLE IF NOT EXISTS standings (
+        player TEXT PRIMARY KEY,
+        points INTEGER NOT NULL DEFAULT 0,
+        gd INTEGER NOT NULL DEFAULT 0,
+        played INTEGER NOT NULL DEFAULT 0,
+        wins INTEGER NOT NULL DEFAULT 0,
+        draws INTEGER NOT NULL DEFAULT 0,
+        losses INTEGER NOT NULL DEFAULT 0,
+        goals_for INTEGER NOT NULL DEFAULT 0,
+        goals_against INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE INDEX IF NOT EXISTS idx_standings_rank ON standings (points DESC, gd DESC);
+
+    CREATE TABLE IF NOT EXISTS data_version (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        version INTEGER NOT NULL
+    );
+    INSERT OR IGNORE INTO data_version (id, version) VALUES (1, 0);
+
+    DROP TRIGGER IF EXISTS standings_player_insert;
+    DROP TRIGGER IF EXISTS standings_player_delete;
+    DROP TRIGGER IF EXISTS standings_match_insert;
+    DROP TRIGGER IF EXISTS standings_match_update;
+    DROP TRIGGER IF EXISTS standings_match_delete;
+    CREATE TRIGGER standings_player_insert AFTER INSERT ON players BEGIN
+        INSERT OR IGNORE INTO standings (player) VALUES (NEW.name);
+        {BUMP_VERSION}
+    END;
+    CREATE TRIGGER standings_player_delete AFTER DELETE ON players BEGIN
+        DELETE FROM standings WHERE player = OLD.name;
+        {BUMP_VERSION}
+    END;
+    CREATE TRIGGER standings_match_insert AFTER INSERT ON matches BEGIN
+        {standings_delta("NEW", 1)}
+        {BUMP_VERSION}
+    END;
+    CREATE TRIGGER standings_match_update
+    AFTER UPDATE OF home_player, away_player, home_goals, away_goals ON matches BEGIN
+        {standings_delta("OLD", -1)}
+        {standings_delta("NEW", 1)}
+        {BUMP_VERSION}
+    END;
+    CREATE TRIGGER standings_match_delete AFTER DELETE ON matches BEGIN
+        {standings_delta("OLD", -1)}
+        {BUMP_VERSION}
+    END;
+
+    DELETE FROM standings;
+    INSERT INTO standings (player, points, gd, played, wins, draws, losses, goals_for, goals_against)
+        SELECT p.name,
+               COALESCE(SUM(3 * (r.gf > r.ga) + (r.gf = r.ga)), 0),
+               COALESCE(SUM(r.gf - r.ga), 0),
+               COUNT(r.gf),
+               COALESCE(SUM(r.gf > r.ga), 0),
+               COALESCE(SUM(r.gf = r.ga), 0),
+               COALESCE(SUM(r.gf < r.ga), 0),
+               COALESCE(SUM(r.gf), 0),
+               COALESCE(SUM(r.ga), 0)
+        FROM players p
+        LEFT JOIN (
+            SELECT home_player AS player, home_goals AS gf, away_goals AS ga FROM matches
+            WHERE home_goals IS NOT NULL AND away_goals IS NOT NULL
+            UNION ALL
+            SELECT away_player, away_goals, home_goals FROM matches
+            WHERE home_goals IS NOT NULL AND away_goals IS NOT NULL
+        ) r ON r.player = p.name
+        GROUP BY p.id
+        ORDER BY p.id;
+    ''',
+    # 4: matches and standings reference players.id instead of repeating names.
+    # Removing a player cascades to their fixtures (whose delete triggers revert
+    # the opponents' standings) and to their standings row
+    f'''
+    CREATE TABLE matches_new (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        home_id INTEGER NOT NULL REFERENCES players (id) ON DELETE CASCADE,
+        away_id INTEGER NOT NULL REFERENCES players (id) ON DELETE CASCADE,
+        round TEXT,
+        time TEXT,
+        home_goals INTEGER,
+        away_goals INTEGER
+    );
+    INSERT INTO matches_new (id, home_id, away_id, round, time, home_goals, away_goals)
+        SELECT m.id, h.id, a.id, m.round, m.time, m.home_goals, m.away_goals
+        FROM matches m
+        JOIN players h ON h.name = m.home_player
+        JOIN players a ON a.name = m.away_player;
+    DROP TABLE matches;
+    ALTER TABLE matches_new RENAME TO matches;
+    CREATE INDEX idx_matches_pending ON matches (round) WHERE home_goals IS NULL;
+    CREATE INDEX idx_matches_played ON matches (id) WHERE home_goals IS NOT NULL;
+    CREATE INDEX idx_matches_pair ON matches (home_id, away_id);
+    CREATE INDEX idx_matches_away ON matches (away_id);
+
+    DROP TRIGGER standings_player_insert;
+    DROP TRIGGER standings_player_delete;
+    DROP TABLE standings;
+    CREATE TABLE standings (
+        player_id INTEGER PRIMARY KEY REFERENCES players (id) ON DELETE CASCADE,
+        points INTEGER NOT NULL DEFAULT 0,
+        gd INTEGER NOT NULL DEFAULT 0,
+        played INTEGER NOT NULL DEFAULT 0,
+        wins INTEGER NOT NULL DEFAULT 0,
+        draws INTEGER NOT NULL DEFAULT 0,
+        losses INTEGER NOT NULL DEFAULT 0,
+        goals_for INTEGER NOT NULL DEFAULT 0,
+        goals_against INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE INDEX idx_standings_rank ON standings (points DESC, gd DESC);
+
+    CREATE TRIGGER standings_player_insert AFTER INSERT ON players BEGIN
+        INSERT OR IGNORE INTO standings (player_id) VALUES (NEW.id);
+        {BUMP_VERSION}
+    END;
+    CREATE TRIGGER standings_player_delete AFTER DELETE ON players BEGIN
+        {BUMP_VERSION}
+    END;
+    CREATE TRIGGER standings_player_rename AFTER UPDATE OF name ON players BEGIN
+        {BUMP_VERSION}
+    END;
+    CREATE TRIGGER standings_match_insert AFTER INSERT ON matches BEGIN
+        {standings_delta("NEW", 1, "home_id", "away_id", "player_id")}
+        {BUMP_VERSION}
+    END;
+    CREATE TRIGGER standings_match_update
+    AFTER UPDATE OF home_id, away_id, home_goals, away_goals ON matches BEGIN
+        {standings_delta("OLD", -1, "home_id", "away_id", "player_id")}
+        {standings_delta("NEW", 1, "home_id", "away_id", "player_id")}
+        {BUMP_VERSION}
+    END;
+    CREATE TRIGGER standings_match_delete AFTER DELETE ON matches BEGIN
+        {standings_delta("OLD", -1, "home_id", "away_id", "player_id")}
+        {BUMP_VERSION}
+    END;
+
+    INSERT INTO standings (player_id, points, gd, played, wins, draws, losses, goals_for, goals_against)
+        SELECT p.id,
+               COALESCE(SUM(3 * (r.gf > r.ga) + (r.gf = r.ga)), 0),
+               COALESCE(SUM(r.gf - r.ga), 0),
+               COUNT(r.gf),
+               COALESCE(SUM(r.gf > r.ga), 0),
+               COALESCE(SUM(r.gf = r.ga), 0),
+               COALESCE(SUM(r.gf < r.ga), 0),
+               COALESCE(SUM(r.gf), 0),
+               COALESCE(SUM(r.ga), 0)
+        FROM players p
+        LEFT JOIN (
+            SELECT home_id AS player_id, home_goals AS gf, away_goals AS ga FROM matches
+            WHERE home_goals IS NOT NULL AND away_goals IS NOT NULL
+            UNION ALL
+            SELECT away_id, away_goals, home_goals FROM matches
+            WHERE home_goals IS NOT NULL AND away_goals IS NOT NULL
+        ) r ON r.player_id = p.id
+        GROUP BY p.id;
+    ''',
+    # 5: several leagues per database, each with its own roster size and seasons.
+    # Players belong to a league, fixtures and standings to a season, and the data
+    # version moves per league so one league's scores don't invalidate another's caches.
+    # Existing data becomes the first season of the original league
+    f'''
+    CREATE TABLE leagues (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL UNIQUE,
+        roster_size INTEGER NOT NULL DEFAULT 10 CHECK (roster_size BETWEEN 2 AND 500),
+        data_version INTEGER NOT NULL DEFAULT 0
+    );
+    INSERT INTO leagues (id, name, roster_size) VALUES (1, 'PES 2025 Ramadhan League', 10);
+    CREATE TABLE seasons (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        league_id INTEGER NOT NULL REFERENCES leagues (id) ON DELETE CASCADE,
+        name TEXT NOT NULL,
+        UNIQUE (league_id, name)
+    );
+    INSERT INTO seasons (id, league_id, name) VALUES (1, 1, '2025');
+
+    CREATE TABLE players_new (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        league_id INTEGER NOT NULL REFERENCES leagues (id) ON DELETE CASCADE,
+        name TEXT NOT NULL,
+        UNIQUE (league_id, name)
+    );
+    INSERT INTO players_new (id, league_id, name)
+        SELECT id, 1, COALESCE(name, 'Player ' || id) FROM players;
+    DROP TABLE players;
+    ALTER TABLE players_new RENAME TO players;
+
+    DROP TRIGGER standings_match_insert;
+    DROP TRIGGER standings_match_update;
+    DROP TRIGGER standings_match_delete;
+    ALTER TABLE matches ADD COLUMN season_id INTEGER REFERENCES seasons (id) ON DELETE CASCADE;
+    UPDATE matches SET season_id = 1;
+    DROP INDEX idx_matches_pending;
+    DROP INDEX idx_matches_played;
+    CREATE INDEX idx_matches_season ON matches (season_id, round);
+    CREATE INDEX idx_matches_pending ON matches (season_id, round) WHERE home_goals IS NULL;
+    CREATE INDEX idx_matches_played ON matches (season_id, id) WHERE home_goals IS NOT NULL;
+
+    DROP TABLE standings;
+    DROP TABLE data_version;
+    CREATE TABLE standings (
+        season_id INTEGER NOT NULL REFERENCES seasons (id) ON DELETE CASCADE,
+        player_id INTEGER NOT NULL REFERENCES players (id) ON DELETE CASCADE,
+        points INTEGER NOT NULL DEFAULT 0,
+        gd INTEGER NOT NULL DEFAULT 0,
+        played INTEGER NOT NULL DEFAULT 0,
+        wins INTEGER NOT NULL DEFAULT 0,
+        draws INTEGER NOT NULL DEFAULT 0,
+        losses INTEGER NOT NULL DEFAULT 0,
+        goals_for INTEGER NOT NULL DEFAULT 0,
+        goals_against INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (season_id, player_id)
+    );
+    CREATE INDEX idx_standings_rank ON standings (season_id, points DESC, gd DESC);
+
+    CREATE TRIGGER standings_player_insert AFTER INSERT ON players BEGIN
+        INSERT OR IGNORE INTO standings (season_id, player_id)
+            SELECT id, NEW.id FROM seasons WHERE league_id = NEW.league_id;
+        {bump_league("NEW.league_id")}
+    END;
+    CREATE TRIGGER standings_player_delete AFTER DELETE ON players BEGIN
+        {bump_league("OLD.league_id")}
+    END;
+    CREATE TRIGGER standings_player_rename AFTER UPDATE OF name ON players BEGIN
+        {bump_league("NEW.league_id")}
+    END;
+    CREATE TRIGGER standings_season_insert AFTER INSERT ON seasons BEGIN
+        INSERT OR IGNORE INTO standings (season_id, player_id)
+            SELECT NEW.id, id FROM players WHERE league_id = NEW.league_id;
+        {bump_league("NEW.league_id")}
+    END;
+    CREATE TRIGGER standings_season_delete AFTER DELETE ON seasons BEGIN
+        {bump_league("OLD.league_id")}
+    END;
+    {season_match_triggers()}
+
+    INSERT INTO standings (season_id, player_id, points, gd, played, wins, draws, losses, goals_for, goals_against)
+        SELECT s.id, p.id,
+               COALESCE(SUM(3 * (r.gf > r.ga) + (r.gf = r.ga)), 0),
+               COALESCE(SUM(r.gf - r.ga), 0),
+               COUNT(r.gf),
+               COALESCE(SUM(r.gf > r.ga), 0),
+               COALESCE(SUM(r.gf = r.ga), 0),
+               COALESCE(SUM(r.gf < r.ga), 0),
+               COALESCE(SUM(r.gf), 0),
+               COALESCE(SUM(r.ga), 0)
+        FROM seasons s
+        JOIN players p ON p.league_id = s.league_id
+        LEFT JOIN (
+            SELECT season_id, home_id AS player_id, home_goals AS gf, away_goals AS ga FROM matches
+            WHERE home_goals IS NOT NULL AND away_goals IS NOT NULL
+            UNION ALL
+            SELECT season_id, away_id, away_goals, home_goals FROM matches
+            WHERE home_goals IS NOT NULL AND away_goals IS NOT NULL
+        ) r ON r.season_id = s.id AND r.player_id = p.id
+        GROUP BY s.id, p.id;
+    ''',
+    # 6: rounds are stored as integers instead of "Round N" labels, so they sort
+    # and compare numerically; the label is a display concern
+    f'''
+    CREATE TABLE matches_new (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        season_id INTEGER NOT NULL REFERENCES seasons (id) ON DELETE CASCADE,
+        home_id INTEGER NOT NULL REFERENCES players (id) ON DELETE CASCADE,
+        away_id INTEGER NOT NULL REFERENCES players (id) ON DELETE CASCADE,
+        round INTEGER NOT NULL,
+        time TEXT,
+        home_goals INTEGER,
+        away_goals INTEGER
+    );
+    INSERT INTO matches_new (id, season_id, home_id, away_id, round, time, home_goals, away_goals)
+        SELECT id, season_id, home_id, away_id,
+               COALESCE(CAST(CASE WHEN round LIKE 'Round %' THEN substr(round, 7) ELSE round END AS INTEGER), 0),
+               time, home_goals, away_goals
+        FROM matches;
+    DROP TABLE matches;
+    ALTER TABLE matches_new RENAME TO matches;
+    CREATE INDEX idx_matches_season ON matches (season_id, round);
+    CREATE INDEX idx_matches_pending ON matches (season_id, round) WHERE home_goals IS NULL;
+    CREATE INDEX idx_matches_played ON matches (season_id, id) WHERE home_goals IS NOT NULL;
+    CREATE INDEX idx_matches_pair ON matches (home_id, away_id);
+    CREATE INDEX idx_matches_away ON matches (away_id);
+    {season_match_triggers()}
+    ''',
+    # 7: fixtures get a real kickoff (ISO 8601 "YYYY-MM-DDTHH:MM", which sorts
+    # chronologically) instead of a bare "20:00". Old times carry no date, so
+    # existing fixtures start out unscheduled until their slots are reallocated
+    f'''
+    CREATE TABLE matches_new (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        season_id INTEGER NOT NULL REFERENCES seasons (id) ON DELETE CASCADE,
+        home_id INTEGER NOT NULL REFERENCES players (id) ON DELETE CASCADE,
+        away_id INTEGER NOT NULL REFERENCES players (id) ON DELETE CASCADE,
+        round INTEGER NOT NULL,
+        kickoff TEXT,
+        home_goals INTEGER,
+        away_goals INTEGER
+    );
+    INSERT INTO matches_new (id, season_id, home_id, away_id, round, home_goals, away_goals)
+        SELECT id, season_id, home_id, away_id, round, home_goals, away_goals FROM matches;
+    DROP TABLE matches;
+    ALTER TABLE matches_new RENAME TO matches;
+    CREATE INDEX idx_matches_season ON matches (season_id, round);
+    CREATE INDEX idx_matches_pending ON matches (season_id, round) WHERE home_goals IS NULL;
+    CREATE INDEX idx_matches_played ON matches (season_id, id) WHERE home_goals IS NOT NULL;
+    CREATE INDEX idx_matches_pair ON matches (home_id, away_id);
+    CREATE INDEX idx_matches_away ON matches (away_id);
+    CREATE INDEX idx_matches_kickoff ON matches (season_id, kickoff, id) WHERE home_goals IS NULL;
+    {season_match_triggers()}
+    ''',
+    # 8: each league chooses how players level on points are separated
+    '''
+    ALTER TABLE leagues ADD COLUMN tiebreakers TEXT NOT NULL
+        DEFAULT 'gd,goals_for,h2h_points,h2h_gd,wins,away_goals';
+    ''',
+    # 9: Elo ratings per season, updated as scores are recorded (see ratings.py).
+    # Seasons played before this are rated on first use
+    '''
+    CREATE TABLE ratings (
+        season_id INTEGER NOT NULL REFERENCES seasons (id) ON DELETE CASCADE,
+        player_id INTEGER NOT NULL REFERENCES players (id) ON DELETE CASCADE,
+        rating REAL NOT NULL,
+        games INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (season_id, player_id)
+    );
+    ''',
+    # 10: the table as it stood after each round (see snapshots.py), so history
+    # views are indexed reads instead of replays. Existing seasons fill in on first use
+    '''
+    CREATE TABLE standings_snapshots (
+        season_id INTEGER NOT NULL REFERENCES seasons (id) ON DELETE CASCADE,
+        round INTEGER NOT NULL,
+        player_id INTEGER NOT NULL REFERENCES players (id) ON DELETE CASCADE,
+        position INTEGER NOT NULL,
+        points INTEGER NOT NULL,
+        gd INTEGER NOT NULL,
+        played INTEGER NOT NULL,
+        wins INTEGER NOT NULL,
+        draws INTEGER NOT NULL,
+        losses INTEGER NOT NULL,
+        goals_for INTEGER NOT NULL,
+        goals_against INTEGER NOT NULL,
+        PRIMARY KEY (season_id, round, player_id)
+    );
+    ''',
+    # 11: append-only log of everything written to a fixture's result or kickoff
+    # (see events.py), and how far each derived-data consumer has read it. Results
+    # recorded before the log are entered as its first events, already consumed.
+    # match_id has no foreign key so the audit trail outlives removed players
+    '''
+    CREATE TABLE match_events (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        season_id INTEGER NOT NULL REFERENCES seasons (id) ON DELETE CASCADE,
+        match_id INTEGER NOT NULL,
+        kind TEXT NOT NULL CHECK (kind IN ('result', 'correction', 'void', 'kickoff')),
+        home_goals INTEGER,
+        away_goals INTEGER,
+        kickoff TEXT,
+        entered_by TEXT,
+        entered_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%S', 'now'))
+    );
+    CREATE INDEX idx_match_events_match ON match_events (match_id, seq);
+    CREATE INDEX idx_match_events_season ON match_events (season_id, seq);
+    CREATE TRIGGER match_events_append_only BEFORE UPDATE ON match_events BEGIN
+        SELECT RAISE(ABORT, 'match_events is append-only');
+    END;
+    CREATE TABLE event_consumers (
+        consumer TEXT NOT NULL,
+        season_id INTEGER NOT NULL REFERENCES seasons (id) ON DELETE CASCADE,
+        last_seq INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (consumer, season_id)
+    );
+    INSERT INTO match_events (season_id, match_id, kind, home_goals, away_goals)
+    SELECT season_id, id, 'result', home_goals, away_goals FROM matches
+    WHERE home_goals IS NOT NULL AND away_goals IS NOT NULL ORDER BY season_id, round, id;
+    INSERT INTO event_consumers (consumer, season_id, last_seq)
+    SELECT c.consumer, e.season_id, MAX(e.seq) FROM match_events e
+    CROSS JOIN (SELECT 'ratings' AS consumer UNION ALL SELECT 'snapshots') c
+    GROUP BY c.consumer, e.season_id;
+    ''',
+    # 12: rescheduling bumps the league version too, so open dashboards pick up
+    # moved kickoffs along with new results
+    f'''
+    CREATE TRIGGER matches_kickoff_update AFTER UPDATE OF kickoff ON matches BEGIN
+        {bump_league("(SELECT league_id FROM seasons WHERE id = NEW.season_id)")}
+    END;
+    ''',
+    # 13: the log is append-only for deletes too, and keeps its events when a season
+    # goes: season_id loses its cascading foreign key, as match_id never had one
+    '''
+    CREATE TABLE match_events_new (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        season_id INTEGER NOT NULL,
+        match_id INTEGER NOT NULL,
+        kind TEXT NOT NULL CHECK (kind IN ('result', 'correction', 'void', 'kickoff')),
+        home_goals INTEGER,
+        away_goals INTEGER,
+        kickoff TEXT,
+        entered_by TEXT,
+        entered_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%S', 'now'))
+    );
+    INSERT INTO match_events_new (seq, season_id, match_id, kind, home_goals, away_goals, kickoff, entered_by, entered_at)
+        SELECT seq, season_id, match_id, kind, home_goals, away_goals, kickoff, entered_by, entered_at FROM match_events;
+    DROP TABLE match_events;
+    ALTER TABLE match_events_new RENAME TO match_events;
+    CREATE INDEX idx_match_events_match ON match_events (match_id, seq);
+    CREATE INDEX idx_match_events_season ON match_events (season_id, seq);
+    CREATE TRIGGER match_events_append_only BEFORE UPDATE ON match_events BEGIN
+        SELECT RAISE(ABORT, 'match_events is append-only');
+    END;
+    CREATE TRIGGER match_events_no_delete BEFORE DELETE ON match_events BEGIN
+        SELECT RAISE(ABORT, 'match_events is append-only');
+    END;
+    ''',
+    # 14: rescheduling bumps its own counter instead of data_version, so moving a
+    # kickoff refreshes the schedule views without discarding result-derived caches
+    '''
+    ALTER TABLE leagues ADD COLUMN schedule_version INTEGER NOT NULL DEFAULT 0;
+    DROP TRIGGER matches_kickoff_update;
+    CREATE TRIGGER matches_kickoff_update AFTER UPDATE OF kickoff ON matches BEGIN
+        UPDATE leagues SET schedule_version = schedule_version + 1
+        WHERE id = (SELECT league_id FROM seasons WHERE id = NEW.season_id);
+    END;
+    ''',
+]
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import standings
+
+# Results listed in the form guide, most recent last
+FORM_GAMES = 5
+PLAYER_STATS_COLUMNS = ["played", "wins", "draws", "losses", "goals_for", "goals_against", "clean_sheets",
+                        "biggest_win", "current_streak", "longest_win_streak", "longest_unbeaten", "form"]
+
+
+def load_player_results(conn, season_id):
+    """Every played match from both sides: one (player, opponent, gf, ga) row per player and match,
+    grouped by player in the order the matches were played."""
+    return pd.read_sql('''SELECT player_id, opponent_id, gf, ga FROM (
+            SELECT id, round, home_id AS player_id, away_id AS opponent_id, home_goals AS gf, away_goals AS ga
+            FROM matches WHERE season_id = :season AND home_goals IS NOT NULL AND away_goals IS NOT NULL
+            UNION ALL
+            SELECT id, round, away_id, home_id, away_goals, home_goals
+            FROM matches WHERE season_id = :season AND home_goals IS NOT NULL AND away_goals IS NOT NULL
+        )
+        ORDER BY player_id, round, id''', conn, params={"season": season_id})
+
+
+def runs(player, values):
+    """Consecutive equal values of each player, in order, as (player, value, length) rows."""
+    # A new run starts wherever the player or the value changes
+    starts = np.ones(len(values), bool)
+    starts[1:] = (player[1:] != player[:-1]) | (values[1:] != values[:-1])
+    run = np.cumsum(starts)
+    frame = pd.DataFrame({"player": player, "value": values, "run": run})
+    return frame.groupby("run").agg(player=("player", "first"), value=("value", "first"), length=("run", "size"))
+
+
+def compute_player_stats(players, results):
+    """Per-player season statistics indexed by player id, from load_player_results() rows.
+
+    players maps id -> name; the opponent in biggest_win is given by name.
+    """
+    gf, ga = results["gf"].to_numpy(np.int64), results["ga"].to_numpy(np.int64)
+    player = results["player_id"].to_numpy()
+    outcome = np.select([gf > ga, gf < ga], ["W", "L"], "D")
+    frame = pd.DataFrame({
+        "player": player, "goals_for": gf, "goals_against": ga, "played": 1,
+        "wins": (gf > ga).astype(np.int64), "draws": (gf == ga).astype(np.int64),
+        "losses": (gf < ga).astype(np.int64), "clean_sheets": (ga == 0).astype(np.int64), "outcome": outcome,
+    })
+    stats = frame.drop(columns="outcome").groupby("player").sum()
+
+    # Widest margin, then most goals scored, then the earliest such win
+    wins = results.assign(margin=gf - ga)[gf > ga]
+    best = wins.sort_values(["margin", "gf"], ascending=False, kind="stable").drop_duplicates("player_id")
+    stats["biggest_win"] = pd.Series(
+        [f"{w.gf}-{w.ga} vs {players.get(w.opponent_id, '?')}" for w in best.itertuples()],
+        index=best["player_id"].to_numpy(), dtype=object)
+
+    streaks = runs(player, outcome)
+    current = streaks.groupby("player").last()
+    stats["current_streak"] = current["value"] + current["length"].astype(str)
+    stats["longest_win_streak"] = streaks[streaks["value"] == "W"].groupby("player")["length"].max()
+    unbeaten = runs(player, outcome != "L")
+    stats["longest_unbeaten"] = unbeaten[unbeaten["value"]].groupby("player")["length"].max()
+    stats["form"] = frame.groupby("player").tail(FORM_GAMES).groupby("player")["outcome"].agg("".join)
+
+    stats = stats.reindex(list(players))
+    counts = ["played", "wins", "draws", "losses", "goals_for", "goals_against", "clean_sheets",
+              "longest_win_streak", "longest_unbeaten"]
+    stats[counts] = stats[counts].fillna(0).astype(np.int64)
+    text = ["biggest_win", "current_streak", "form"]
+    stats[text] = stats[text].fillna("")
+    return stats[PLAYER_STATS_COLUMNS]
+
+
+def top_scorer(stats):
+    """(name, goals) of the player with the most goals in a get_player_stats() frame, or (None, 0)."""
+    goals_for = stats["goals_for"]
+    if goals_for.empty or goals_for.max() == 0:
+        return None, 0
+    return goals_for.idxmax(), int(goals_for.max())
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def get_player_stats(_conn, season_id, version):
+    """Player statistics by name, shared by every session until the league's data version changes."""
+    players = standings.load_season_players(_conn, season_id)
+    stats = compute_player_stats(players, load_player_results(_conn, season_id))
+    return stats.rename(index=players)
+
@@ -0,0 +1,92 @@
+from itertools import groupby
+
+# Criteria that separate players level on points, in the order a league applies them
+TIEBREAKERS = {
+    "gd": "Goal difference",
+    "goals_for": "Goals scored",
+    "h2h_points": "Head-to-head points",
+    "h2h_gd": "Head-to-head goal difference",
+    "wins": "Wins",
+    "away_goals": "Away goals",
+}
+DEFAULT_TIEBREAKERS = ("gd", "goals_for", "h2h_points", "h2h_gd", "wins", "away_goals")
+# Table zones: the top spots (Champions League style) and the relegation places
+TOP_SPOTS = 4
+RELEGATION_SPOTS = 3
+
+
+def parse_tiebreakers(text):
+    """A stored comma-separated chain as a tuple, rejecting unknown criteria."""
+    chain = tuple(name for name in (text or "").split(",") if name)
+    unknown = [name for name in chain if name not in TIEBREAKERS]
+    if unknown:
+        raise ValueError(f"Unknown tiebreakers {unknown}, expected some of {list(TIEBREAKERS)}")
+    return chain
+
+
+def load_head_to_head(conn, season_id, through_round=None):
+    """Pairwise results matrix: player -> opponent -> (points, goal difference) over their played games.
+
+    through_round limits it to the first rounds of the season, for historical tables.
+    """
+    c = conn.execute('''SELECT player_id, opponent_id, SUM(3 * (gf > ga) + (gf = ga)), SUM(gf - ga)
+        FROM (
+            SELECT home_id AS player_id, away_id AS opponent_id, home_goals AS gf, away_goals AS ga FROM matches
+            WHERE season_id = :season AND home_goals IS NOT NULL AND away_goals IS NOT NULL
+                  AND (:through IS NULL OR round <= :through)
+            UNION ALL
+            SELECT away_id, home_id, away_goals, home_goals FROM matches
+            WHERE season_id = :season AND home_goals IS NOT NULL AND away_goals IS NOT NULL
+                  AND (:through IS NULL OR round <= :through)
+        )
+        GROUP BY player_id, opponent_id''', {"season": season_id, "through": through_round})
+    pairs = {}
+    for player, opponent, points, gd in c:
+        pairs.setdefault(player, {})[opponent] = (points, gd)
+    return pairs
+
+
+def load_away_goals(conn, season_id, through_round=None):
+    """Goals each player scored away from home this season (optionally up to a round)."""
+    return dict(conn.execute('''SELECT away_id, SUM(away_goals) FROM matches
+                                WHERE season_id = :season AND home_goals IS NOT NULL AND away_goals IS NOT NULL
+                                      AND (:through IS NULL OR round <= :through)
+                                GROUP BY away_id''', {"season": season_id, "through": through_round}).fetchall())
+
+
+def rank(table, tiebreakers=DEFAULT_TIEBREAKERS, head_to_head=None, away_goals=None):
+    """Player ids ordered by points, then each tiebreaker in turn, then registration (id) order.
+
+    table maps a player id to its standings row (points, gd, goals_for, wins, ...).
+    head_to_head and away_goals are callables returning load_head_to_head() and
+    load_away_goals() results; they are only called once a tie actually reaches
+    those criteria. Head-to-head mini-tables only cover the players still level.
+    """
+    cache = {}
+
+    def lookup(name, loader):
+        if name not in cache:
+            cache[name] = loader() if loader else {}
+        return cache[name]
+
+    def values(criterion, ids):
+        if criterion in ("h2h_points", "h2h_gd"):
+            pairs, group = lookup("h2h", head_to_head), set(ids)
+            column = 0 if criterion == "h2h_points" else 1
+            return {i: sum(result[column] for opponent, result in pairs.get(i, {}).items() if opponent in group)
+                    for i in ids}
+        if criterion == "away_goals":
+            goals = lookup("away_goals", away_goals)
+            return {i: goals.get(i, 0) for i in ids}
+        return {i: table[i][criterion] for i in ids}
+
+    def order(ids, chain):
+        if len(ids) == 1 or not chain:
+            return sorted(ids)
+        key = values(chain[0], ids)
+        ranked = []
+        for _, tied in groupby(sorted(ids, key=key.get, reverse=True), key=key.get):
+            ranked += order(list(tied), chain[1:])
+        return ranked
+
+    return order(list(table), ("points",) + tuple(tiebreakers))
@@ -0,0 +1,148 @@
+import numpy as np
+import streamlit as st
+
+INITIAL_RATING = 1500.0
+# Rating points at stake in an even game; wider wins move ratings further
+K_FACTOR = 32
+# Share of drawn games assumed until the season has enough results of its own
+DEFAULT_DRAW_RATE = 0.25
+MIN_GAMES_FOR_DRAW_RATE = 10
+
+
+def expected_score(rating, opponent):
+    """Elo expectation (win = 1, draw = 0.5) of a player against an opponent; works on arrays."""
+    return 1 / (1 + 10 ** ((opponent - rating) / 400))
+
+
+def margin_multiplier(goal_difference):
+    """World Football Elo scaling: a 3-0 counts for more than a 1-0."""
+    margin = abs(goal_difference)
+    if margin <= 1:
+        return 1.0
+    if margin == 2:
+        return 1.5
+    return (11 + margin) / 8
+
+
+def update(ratings, games, results):
+    """Apply (home_id, away_id, home_goals, away_goals) results in order to rating and games-played dicts."""
+    for home, away, home_goals, away_goals in results:
+        home_rating = ratings.get(home, INITIAL_RATING)
+        away_rating = ratings.get(away, INITIAL_RATING)
+        score = 1.0 if home_goals > away_goals else 0.5 if home_goals == away_goals else 0.0
+        change = K_FACTOR * margin_multiplier(home_goals - away_goals) * (score - expected_score(home_rating, away_rating))
+        ratings[home] = home_rating + change
+        ratings[away] = away_rating - change
+        games[home] = games.get(home, 0) + 1
+        games[away] = games.get(away, 0) + 1
+
+
+def load_ratings(conn, season_id):
+    """Stored ratings and games played of a season as two player id -> value dicts."""
+    rows = conn.execute("SELECT player_id, rating, games FROM ratings WHERE season_id = ?", (season_id,)).fetchall()
+    return {p: rating for p, rating, _ in rows}, {p: games for p, _, games in rows}
+
+
+def save_ratings(conn, season_id, ratings, games):
+    conn.executemany(
+        """INSERT INTO ratings (season_id, player_id, rating, games) VALUES (?, ?, ?, ?)
+           ON CONFLICT (season_id, player_id) DO UPDATE SET rating = excluded.rating, games = excluded.games""",
+        [(season_id, p, rating, games[p]) for p, rating in ratings.items()]
+    )
+
+
+def record_results(conn, season_id, results):
+    """Incrementally rate newly recorded results; call inside a write transaction."""
+    ratings, games = load_ratings(conn, season_id)
+    players = {p for result in results for p in result[:2]}
+    ratings = {p: r for p, r in ratings.items() if p in players}
+    update(ratings, games, results)
+    save_ratings(conn, season_id, ratings, games)
+
+
+def replay_ratings(conn, season_id):
+    """Replace a season's ratings with a replay of its played matches; call inside a write transaction.
+
+    Elo depends on order, so results replay in the order they were entered (their
+    latest result event in match_events), as record_results applied them;
+    corrections keep their result's place. Results the log doesn't hold go last,
+    in round order.
+    """
+    results = conn.execute("""SELECT m.home_id, m.away_id, m.home_goals, m.away_goals FROM matches m
+                              LEFT JOIN (SELECT match_id, MAX(seq) AS seq FROM match_events
+                                         WHERE season_id = :season AND kind = 'result' GROUP BY match_id) e
+                                     ON e.match_id = m.id
+                              WHERE m.season_id = :season AND m.home_goals IS NOT NULL AND m.away_goals IS NOT NULL
+                              ORDER BY e.seq IS NULL, e.seq, m.round, m.id""", {"season": season_id}).fetchall()
+    ratings, games = {}, {}
+    update(ratings, games, results)
+    conn.execute("DELETE FROM ratings WHERE season_id = ?", (season_id,))
+    save_ratings(conn, season_id, ratings, games)
+    return ratings
+
+
+def rebuild_ratings(conn, season_id):
+    """Replay a season's ratings, e.g. after a result was corrected or removed.
+
+    The results are read under the write lock, so a concurrent incremental
+    update can't land between the read and the write.
+    """
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        return replay_ratings(conn, season_id)
+
+
+def ensure_ratings(conn, season_id):
+    """The season's ratings, rebuilt first if they don't account for exactly its played matches.
+
+    That covers seasons played before ratings existed and results removed along
+    with a player.
+    """
+    ratings, games = load_ratings(conn, season_id)
+    played = conn.execute("SELECT COUNT(*) FROM matches WHERE season_id = ? AND home_goals IS NOT NULL",
+                          (season_id,)).fetchone()[0]
+    if sum(games.values()) != 2 * played:
+        ratings = rebuild_ratings(conn, season_id)
+    return ratings
+
+
+def draw_weight(conn, season_id, ratings):
+    """How strongly an even game tends to a draw, fitted so the model reproduces the season's draw rate."""
+    rows = conn.execute("""SELECT home_id, away_id, home_goals = away_goals FROM matches
+                           WHERE season_id = ? AND home_goals IS NOT NULL AND away_goals IS NOT NULL""",
+                        (season_id,)).fetchall()
+    if len(rows) < MIN_GAMES_FOR_DRAW_RATE:
+        return 2 * DEFAULT_DRAW_RATE
+    home = np.array([ratings.get(r[0], INITIAL_RATING) for r in rows])
+    away = np.array([ratings.get(r[1], INITIAL_RATING) for r in rows])
+    expected = expected_score(home, away)
+    closeness = np.minimum(expected, 1 - expected).mean()
+    draw_rate = sum(r[2] for r in rows) / len(rows)
+    # Capped at 2, where a dead-even game is certain to be drawn
+    return min(2.0, draw_rate / closeness)
+
+
+def match_odds(home_ratings, away_ratings, weight):
+    """Decimal home/draw/away odds for arrays of fixtures in one vectorized pass.
+
+    The draw takes weight * min(E, 1 - E) of the probability, split evenly
+    from both sides, so close games are the likeliest draws.
+    """
+    expected = expected_score(np.asarray(home_ratings, float), np.asarray(away_ratings, float))
+    draw = weight * np.minimum(expected, 1 - expected)
+    probabilities = np.stack([expected - draw / 2, draw, 1 - expected - draw / 2], axis=1)
+    return 1 / np.clip(probabilities, 0.01, None)
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def get_match_odds(_conn, season_id, version):
+    """Home/draw/away odds of every pending fixture, as match id -> (home, draw, away)."""
+    ratings = ensure_ratings(_conn, season_id)
+    pending = _conn.execute("SELECT id, home_id, away_id FROM matches WHERE season_id = ? AND home_goals IS NULL",
+                            (season_id,)).fetchall()
+    if not pending:
+        return {}
+    odds = match_odds([ratings.get(h, INITIAL_RATING) for _, h, _ in pending],
+                      [ratings.get(a, INITIAL_RATING) for _, _, a in pending],
+                      draw_weight(_conn, season_id, ratings))
+    return {match_id: tuple(row) for (match_id, _, _), row in zip(pending, odds.tolist())}
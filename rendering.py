@@ -0,0 +1,158 @@
+from html import escape
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import ranking
+import scheduling
+import standings
+
+# Dashboard styles, sent once per page run; the section templates below only
+# reference these classes, so every card costs a few dozen bytes of markup
+CSS = """<style>
+[data-testid="stHeader"] { margin-bottom: -5rem; }
+.st-emotion-cache-1y4p8pa { padding-top: 2rem; }
+div[data-testid="column"] { padding: 0.5rem; }
+.pl-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(160px, 1fr)); gap: 1rem; margin-bottom: 1rem; }
+.pl-podium { padding: 1.5rem; border-radius: 15px; border: 1px solid #00FF87; text-align: center;
+             box-shadow: 0 4px 8px rgba(0,0,0,0.2); min-height: 220px; display: flex;
+             flex-direction: column; justify-content: space-between; background: #37003C; }
+.pl-podium.p1 { background: linear-gradient(45deg, #37003C 0%, #E90052 100%); }
+.pl-podium.p2 { background: #1D428A; }
+.pl-podium.p3 { background: #00A551; }
+.pl-podium .emoji { font-size: 2rem; margin-bottom: 0.5rem; }
+.pl-podium h3 { margin: 0.5rem 0; color: #00FF87; font-family: 'Arial Black', sans-serif;
+                text-shadow: 0 2px 4px rgba(0,0,0,0.5); }
+.pl-podium .pts { background: linear-gradient(45deg, #FFD700, #FFFFFF); -webkit-background-clip: text;
+                  color: transparent; font-size: 1.8rem; font-weight: bold; margin: 0.5rem 0; }
+.pl-podium .line { color: #FFFFFF; font-size: 0.9rem; border-top: 1px solid #00FF87;
+                   padding-top: 0.5rem; margin: 0 1rem; }
+.pl-legend { color: #00FF87; font-size: 0.9rem; margin-top: -0.5rem; margin-bottom: 1rem; }
+.pl-match { background-color: black; padding: 1rem; border-radius: 10px; border: 1px solid #dee2e6;
+            margin: 0.5rem 0; color: white; }
+.pl-match .row { display: flex; justify-content: space-between; align-items: center; }
+.pl-match .side { flex: 1; text-align: center; font-weight: bold; font-size: 1.1rem; }
+.pl-match .home { text-align: right; font-size: 1rem; }
+.pl-match .away { text-align: left; font-size: 1rem; }
+.pl-match .mid { flex: 0.5; text-align: center; }
+.pl-match .score { font-size: 1.2rem; font-weight: bold; }
+.pl-match .foot { text-align: center; margin-top: 0.5rem; }
+.pl-win { color: #2ecc71; } .pl-loss { color: #e74c3c; } .pl-draw { color: #f1c40f; }
+.pl-badge { color: white; padding: 0.2rem 0.5rem; border-radius: 15px; font-weight: normal; font-size: 0.9rem;
+            background-color: #e74c3c; }
+.pl-badge.fav { background-color: #2ecc71; }
+.pl-stat { padding: 1.5rem; border-radius: 10px; color: white; text-align: center; }
+.pl-stat.goals { background-color: #4b8bff; }
+.pl-stat.scorer { background-color: #2ecc71; }
+.pl-stat.progress { background-color: #f1c40f; }
+.pl-stat .emoji { font-size: 2rem; }
+.pl-stat h3 { margin: 0.5rem 0; }
+.pl-stat .value { font-size: 1.3rem; font-weight: bold; }
+.pl-stat .note { color: rgba(255,255,255,0.8); }
+</style>"""
+
+PODIUM_EMOJIS = ["👑", "🥈", "🥉", "4️⃣"]
+# Classification zone markers: medals for the podium, then the rest of the top spots and the drop zone
+MEDALS = ["🥇", "🥈", "🥉"]
+TOP_ZONE = "🟢"
+RELEGATION_ZONE = "🔻"
+CLASSIFICATION_COLUMNS = {
+    "Pos": st.column_config.NumberColumn("Pos", width="small"),
+    "Zone": st.column_config.TextColumn("", width="small",
+                                        help=f"Top {ranking.TOP_SPOTS} and the bottom {ranking.RELEGATION_SPOTS}"),
+    "Player": st.column_config.TextColumn("Player", width="large"),
+    "Pts": st.column_config.NumberColumn("Pts", width="small"),
+    "GD": st.column_config.NumberColumn("GD", width="small", format="%+d"),
+    **{col: st.column_config.NumberColumn(col, width="small") for col in ("MP", "W", "D", "L", "GF", "GA")},
+}
+
+
+def inject_css():
+    st.markdown(CSS, unsafe_allow_html=True)
+
+
+def section(html):
+    """Send a whole section as one element; markup is kept on one line, as blank lines would end the HTML block."""
+    st.markdown(html, unsafe_allow_html=True)
+
+
+def podium(leaderboard):
+    """The top four of a get_leaderboard() result as one grid of cards."""
+    cards = "".join(
+        f'<div class="pl-podium p{i}"><div><div class="emoji">{emoji}</div><h3>{escape(player)}</h3></div>'
+        f'<div><div class="pts">{stats["Points"]} pts</div>'
+        f'<div class="line"><div>🏃 GD: {stats["GD"]:+}</div><div>✅ W: {stats["Wins"]}</div></div></div></div>'
+        for i, ((player, stats), emoji) in enumerate(zip(leaderboard, PODIUM_EMOJIS), 1)
+    )
+    return (f'<div class="pl-grid">{cards}</div><div class="pl-legend">'
+            '🔺 Ramadhan League ranking system | GD: Goal Difference | MP: Matches Played</div>')
+
+
+def odds_badge(odds):
+    return f'<span class="pl-badge{" fav" if odds < 2.0 else ""}">{odds:.2f}</span>'
+
+
+def upcoming_cards(fixtures):
+    """(home, away, round, kickoff, (home, draw, away) odds) tuples as one block of match cards."""
+    return "".join(
+        f'<div class="pl-match"><div class="row">'
+        f'<div class="side">{escape(home)}<br>{odds_badge(odds[0])}</div>'
+        f'<div class="mid">⚔ {odds_badge(odds[1])}<br>Round {round_num}<br>{scheduling.format_kickoff(kickoff)}</div>'
+        f'<div class="side">{escape(away)}<br>{odds_badge(odds[2])}</div></div></div>'
+        for home, away, round_num, kickoff, odds in fixtures
+    )
+
+
+def result_cards(results):
+    """(home, away, home_goals, away_goals, round) tuples as one block of result cards."""
+    return "".join(
+        f'<div class="pl-match"><div class="row"><div class="side home">{escape(home)}</div>'
+        f'<div class="mid score {"pl-win" if hg > ag else "pl-loss" if hg < ag else "pl-draw"}">{hg} - {ag}</div>'
+        f'<div class="side away">{escape(away)}</div></div><div class="foot">Round {round_num}</div></div>'
+        for home, away, hg, ag, round_num in results
+    )
+
+
+def stat_cards(cards):
+    """(kind, emoji, title, value, note lines) tuples as one grid of statistic cards; kind picks the colour."""
+    return '<div class="pl-grid">' + "".join(
+        f'<div class="pl-stat {kind}"><div class="emoji">{emoji}</div>'
+        f'<h3>{title}</h3><div class="value">{escape(str(value))}</div>'
+        + "".join(f'<div class="note">{escape(note)}</div>' for note in notes) + '</div>'
+        for kind, emoji, title, value, notes in cards
+    ) + '</div>'
+
+
+def classification_frame(leaderboard):
+    """A get_leaderboard() result as a plain frame with integer positions and a zone marker column.
+
+    Zones come from the positions in one vectorized pass; the table is formatted
+    by CLASSIFICATION_COLUMNS rather than a Styler.
+    """
+    n = len(leaderboard)
+    positions = np.arange(1, n + 1)
+    zone = np.where(positions <= ranking.TOP_SPOTS, TOP_ZONE, "").astype(object)
+    if n > ranking.TOP_SPOTS + ranking.RELEGATION_SPOTS:
+        zone[positions > n - ranking.RELEGATION_SPOTS] = RELEGATION_ZONE
+    zone[:len(MEDALS)] = MEDALS[:n]
+    rows = [stats for _, stats in leaderboard]
+    return pd.DataFrame({
+        "Pos": positions,
+        "Zone": zone,
+        "Player": [player for player, _ in leaderboard],
+        "Pts": [s["Points"] for s in rows],
+        "GD": [s["GD"] for s in rows],
+        "MP": [s["Matches Played"] for s in rows],
+        "W": [s["Wins"] for s in rows],
+        "D": [s["Draws"] for s in rows],
+        "L": [s["Losses"] for s in rows],
+        "GF": [s["Goals For"] for s in rows],
+        "GA": [s["Goals Against"] for s in rows],
+    })
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def get_classification(_conn, season_id, version, tiebreakers=ranking.DEFAULT_TIEBREAKERS):
+    """The classification frame, built once per data version and tiebreak chain for every session."""
+    return classification_frame(standings.get_leaderboard(_conn, season_id, version, tiebreakers=tiebreakers))
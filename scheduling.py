@@ -0,0 +1,180 @@
+from collections import namedtuple
+from datetime import datetime, time, timedelta
+
+# A generated fixture; kickoff is a datetime, or None until slots are allocated
+Fixture = namedtuple("Fixture", ["round", "home", "away", "kickoff"])
+
+DEFAULT_KICKOFF = time(20, 0)
+# A PES match with walk-on and handover fits comfortably in half an hour
+SLOT_MINUTES = 30
+
+
+def circle_rounds(players, balanced=True):
+    """One leg by the circle method: a list of rounds, each a list of (home, away) pairs.
+
+    With an odd number of players a bye takes the fixed slot, so sitting out never
+    breaks anyone's home/away pattern. Balanced orientation alternates venues so
+    nobody plays more than two home (or away) games in a row.
+    """
+    order = list(players)
+    if len(order) % 2 == 1:
+        order.insert(0, None)
+    n = len(order)
+    if n < 2:
+        return []
+    fixed, rotating = order[0], order[1:]
+    rounds = []
+    for r in range(n - 1):
+        # Rotate the other players by r places, keeping the first one fixed
+        teams = [fixed] + rotating[len(rotating) - r:] + rotating[:len(rotating) - r]
+        round_matches = []
+        for i in range(n // 2):
+            home, away = teams[i], teams[n - 1 - i]
+            if balanced and (r % 2 == 1 if i == 0 else i % 2 == 1):
+                home, away = away, home
+            if home is not None and away is not None:
+                round_matches.append((home, away))
+        rounds.append(round_matches)
+    return rounds
+
+
+def round_robin(players, legs=2, balanced=True):
+    """Single (legs=1) or double (legs=2) round robin as a list of rounds of (home, away) pairs."""
+    if legs not in (1, 2):
+        raise ValueError("legs must be 1 or 2")
+    first = circle_rounds(players, balanced)
+    if legs == 1 or not first:
+        return first
+    # The second leg swaps venues. Balanced schedules start it with the return
+    # fixtures of the last round, so the turn of the season doesn't create a third
+    # home (or away) game in a row
+    order = [first[-1]] + first[:-1] if balanced else first
+    return first + [[(away, home) for home, away in round_matches] for round_matches in order]
+
+
+def allocate_kickoffs(fixtures, start, slots_per_night=1, stations=1, first_kickoff=DEFAULT_KICKOFF,
+                      slot_minutes=SLOT_MINUTES, unavailable=None):
+    """Give fixtures real kickoff datetimes on consecutive match nights from the start date.
+
+    Each night has slots_per_night kickoff times, slot_minutes apart, and every slot
+    hosts up to `stations` games at once. Rounds are played in order and each starts
+    on a fresh night, spilling over several nights when it doesn't fit in one.
+    unavailable maps a player to the dates they can't play; their fixtures are
+    postponed to the earliest later night with a free station where neither player
+    is already playing, after every regular fixture is placed, so a postponement
+    never pushes another fixture back.
+    """
+    if slots_per_night < 1 or stations < 1:
+        raise ValueError("Need at least one slot and one station per night")
+    unavailable = unavailable or {}
+    capacity = slots_per_night * stations
+    load = []  # fixtures booked per night
+    busy = {}  # player -> nights they play
+
+    def free(home, away, night):
+        if night < len(load) and load[night] >= capacity:
+            return False
+        date = start + timedelta(days=night)
+        return all(date not in unavailable.get(p, ()) and night not in busy.get(p, ()) for p in (home, away))
+
+    def book(fixture, night):
+        while len(load) <= night:
+            load.append(0)
+        slot = load[night] // stations
+        load[night] += 1
+        busy.setdefault(fixture.home, set()).add(night)
+        busy.setdefault(fixture.away, set()).add(night)
+        kickoff = datetime.combine(start + timedelta(days=night), first_kickoff) + timedelta(minutes=slot * slot_minutes)
+        return fixture._replace(kickoff=kickoff)
+
+    allocated, postponed = [], []
+    night, current_round, round_start = 0, None, {}
+    for fixture in fixtures:
+        if fixture.round != current_round:
+            if current_round is not None and night < len(load) and load[night]:
+                night += 1
+            current_round = fixture.round
+            round_start[current_round] = night
+        if night < len(load) and load[night] >= capacity:
+            night += 1
+        if free(fixture.home, fixture.away, night):
+            allocated.append(book(fixture, night))
+        else:
+            postponed.append(len(allocated))
+            allocated.append(fixture)
+    # Only now is every player's regular schedule known
+    for position in postponed:
+        fixture = allocated[position]
+        night = round_start[fixture.round]
+        while not free(fixture.home, fixture.away, night):
+            night += 1
+        allocated[position] = book(fixture, night)
+    return allocated
+
+
+def generate_fixtures(players, legs=2, balanced=True):
+    """Every fixture of a season, in O(N^2) for N players, ready for a single bulk insert."""
+    return [Fixture(index + 1, home, away, None)
+            for index, round_matches in enumerate(round_robin(players, legs, balanced))
+            for home, away in round_matches]
+
+
+def format_kickoff(kickoff):
+    """Display form of a stored ISO kickoff; unscheduled fixtures show as TBD."""
+    if kickoff is None:
+        return "TBD"
+    return datetime.fromisoformat(kickoff).strftime("%a %d %b, %H:%M")
+
+
+# Fixtures per page of the schedule table
+SCHEDULE_PAGE_SIZE = 50
+
+
+def load_rounds(conn, season_id):
+    return [r for (r,) in conn.execute("SELECT DISTINCT round FROM matches WHERE season_id = ? ORDER BY round",
+                                       (season_id,))]
+
+
+def load_schedule_page(conn, season_id, player_id=None, round_number=None, after=None, limit=SCHEDULE_PAGE_SIZE):
+    """One page of a season's fixtures in (round, id) order, optionally one player's or one round's.
+
+    after is the (round, id) of the previous page's last fixture: the page seeks
+    straight past it in the index instead of counting through an OFFSET.
+    Returns (id, home_id, away_id, round, kickoff, home_goals, away_goals) rows.
+    """
+    # Conditions are only added when used, so each filter combination gets its own index plan
+    where, params = ["season_id = ?"], [season_id]
+    if player_id is not None:
+        where.append("(home_id = ? OR away_id = ?)")
+        params += [player_id, player_id]
+    if round_number is not None:
+        where.append("round = ?")
+        params.append(round_number)
+    if after is not None:
+        where.append("(round, id) > (?, ?)")
+        params += list(after)
+    return conn.execute(f"""SELECT id, home_id, away_id, round, kickoff, home_goals, away_goals FROM matches
+                            WHERE {" AND ".join(where)} ORDER BY round, id LIMIT ?""", (*params, limit)).fetchall()
+
+
+def load_upcoming(conn, season_id, limit=5):
+    """The next pending fixtures as (id, home_id, away_id, round, kickoff) rows.
+
+    Scheduled fixtures are a range scan of the kickoff index; unscheduled ones
+    (shown as TBD) only fill the list once the calendar runs out.
+    """
+    upcoming = conn.execute("""SELECT id, home_id, away_id, round, kickoff FROM matches
+                               WHERE season_id = ? AND home_goals IS NULL AND kickoff IS NOT NULL
+                               ORDER BY kickoff, id LIMIT ?""", (season_id, limit)).fetchall()
+    if len(upcoming) < limit:
+        upcoming += conn.execute("""SELECT id, home_id, away_id, round, kickoff FROM matches
+                                    WHERE season_id = ? AND home_goals IS NULL AND kickoff IS NULL
+                                    ORDER BY round, id LIMIT ?""", (season_id, limit - len(upcoming))).fetchall()
+    return upcoming
+
+
+def load_recent_results(conn, season_id, limit=5):
+    """The latest recorded results as (home_id, away_id, home_goals, away_goals, round) rows."""
+    return conn.execute("""SELECT home_id, away_id, home_goals, away_goals, round FROM matches
+                           WHERE season_id = ? AND home_goals IS NOT NULL ORDER BY id DESC LIMIT ?""",
+                        (season_id, limit)).fetchall()
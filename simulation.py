@@ -0,0 +1,178 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import ranking
+import standings
+
+DEFAULT_SIMULATIONS = 100_000
+# Simulated fixtures (seasons x pending fixtures) per task, which bounds each
+# task's goal arrays to a few MB however big the league is
+BATCH_CELLS = 2_000_000
+# Simulated fixtures per dashboard refresh; large leagues get fewer seasons
+CELL_BUDGET = 40_000_000
+# Fewest seasons worth simulating. Seasons with more pending fixtures than the
+# budget covers at that count (over 200 players early in a double round robin) get no outlook
+MIN_SIMULATIONS = 1_000
+MAX_PENDING = CELL_BUDGET // MIN_SIMULATIONS
+# Scores are capped here, the tail probability is folded into the top score
+MAX_GOALS = 10
+# Largest fixtures x players incidence matrix worth building (4 bytes per cell)
+DENSE_LIMIT = 2_000_000
+WORKERS = int(os.environ.get("PES_SIM_WORKERS", os.cpu_count() or 1))
+# Pseudo-games at the league average that every player's rates start from, so a
+# single 5-0 doesn't make someone a 5-goals-a-game striker
+PRIOR_GAMES = 3
+# Goals per player per game assumed before any match has been played
+DEFAULT_GOALS = 1.4
+
+
+def load_season(conn, season_id):
+    """Player ids, current (points, gd, goals_for) arrays, played results and pending fixtures of a season."""
+    rows = sorted(standings.load_standings(conn, season_id))
+    columns = standings.STANDINGS_COLUMNS
+    player_ids = [row[0] for row in rows]
+    table = {col: np.array([row[1 + columns.index(col)] for row in rows], dtype=np.int64)
+             for col in ("points", "gd", "goals_for")}
+    matches = conn.execute("SELECT home_id, away_id, home_goals, away_goals FROM matches WHERE season_id = ?",
+                           (season_id,)).fetchall()
+    played = [m for m in matches if m[2] is not None and m[3] is not None]
+    pending = [(m[0], m[1]) for m in matches if m[2] is None or m[3] is None]
+    return player_ids, table, played, pending
+
+
+def fit_rates(player_ids, played):
+    """Per-player attack and defense multipliers plus home and away league scoring rates.
+
+    A fixture's expected goals are home_rate * attack[home] * defense[away] for the
+    home side and away_rate * attack[away] * defense[home] for the visitors.
+    """
+    n = len(player_ids)
+    index = {p: i for i, p in enumerate(player_ids)}
+    if not played:
+        return np.ones(n), np.ones(n), DEFAULT_GOALS, DEFAULT_GOALS
+    home = np.array([index[m[0]] for m in played])
+    away = np.array([index[m[1]] for m in played])
+    home_goals = np.array([m[2] for m in played], dtype=float)
+    away_goals = np.array([m[3] for m in played], dtype=float)
+    home_rate, away_rate = home_goals.mean(), away_goals.mean()
+    mean = (home_rate + away_rate) / 2 or DEFAULT_GOALS
+    games = np.bincount(home, minlength=n) + np.bincount(away, minlength=n)
+    scored = np.bincount(home, home_goals, n) + np.bincount(away, away_goals, n)
+    conceded = np.bincount(home, away_goals, n) + np.bincount(away, home_goals, n)
+    prior = PRIOR_GAMES * mean
+    attack = (scored + prior) / ((games + PRIOR_GAMES) * mean)
+    defense = (conceded + prior) / ((games + PRIOR_GAMES) * mean)
+    return attack, defense, home_rate or DEFAULT_GOALS, away_rate or DEFAULT_GOALS
+
+
+def poisson_cdf(rates):
+    """Cumulative Poisson probabilities of 0..MAX_GOALS-1 goals, one row per fixture."""
+    goals = np.arange(MAX_GOALS)
+    log_factorial = np.cumsum(np.log(np.maximum(goals, 1)))
+    pmf = np.exp(goals * np.log(rates[:, None]) - rates[:, None] - log_factorial)
+    return np.cumsum(pmf, axis=1).astype(np.float32)
+
+
+def sample_goals(rng, cdf, sims):
+    """Inverse-CDF Poisson draws: a score is how many cumulative probabilities its uniform exceeds.
+
+    About three times faster than Generator.poisson for per-fixture rates.
+    """
+    draws = rng.random((sims, len(cdf)), dtype=np.float32)
+    goals = np.zeros(draws.shape, np.float32)
+    for column in cdf.T:
+        goals += draws > column
+    return goals
+
+
+def simulate_batch(seed, sims, home, away, home_cdf, away_cdf, points, gd, goals_for):
+    """Play the pending fixtures `sims` times; returns counts[player, final position]."""
+    rng = np.random.default_rng(seed)
+    n, fixtures = len(points), len(home)
+    home_goals = sample_goals(rng, home_cdf, sims)
+    away_goals = sample_goals(rng, away_cdf, sims)
+
+    if fixtures * n <= DENSE_LIMIT:
+        # Fixture -> player incidence matrices turn every season's totals into small matmuls
+        home_onehot = np.zeros((fixtures, n), np.float32)
+        home_onehot[np.arange(fixtures), home] = 1
+        away_onehot = np.zeros((fixtures, n), np.float32)
+        away_onehot[np.arange(fixtures), away] = 1
+
+        def total(base, home_values, away_values):
+            return base + home_values @ home_onehot + away_values @ away_onehot
+    else:
+        # Flat (season, player) slots for both sides of every fixture, summed by bincount
+        offset = (np.arange(sims) * n)[:, None]
+        slots = np.concatenate([offset + home, offset + away], axis=1).ravel()
+
+        def total(base, home_values, away_values):
+            values = np.concatenate([home_values, away_values], axis=1).ravel()
+            return base + np.bincount(slots, values, sims * n).reshape(sims, n)
+
+    draws = home_goals == away_goals
+    final_points = total(points, 3 * (home_goals > away_goals) + draws, 3 * (away_goals > home_goals) + draws)
+    final_gd = total(gd, home_goals - away_goals, away_goals - home_goals)
+    final_goals = total(goals_for, home_goals, away_goals)
+    # Points, goal difference and goals scored, then a coin toss (lexsort's last key is the primary one)
+    order = np.lexsort((rng.random((sims, n)), -final_goals, -final_gd, -final_points), axis=1)
+    return np.bincount((order * n + np.arange(n)).ravel(), minlength=n * n).reshape(n, n)
+
+
+@st.cache_resource(show_spinner=False)
+def process_pool(workers=WORKERS):
+    """One pool per server process; spawned workers don't inherit the server's threads."""
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def simulate_positions(player_ids, table, played, pending, sims=DEFAULT_SIMULATIONS, seed=None, workers=WORKERS):
+    """Probability of each final position: a (player, position) array whose rows sum to 1."""
+    n = len(player_ids)
+    if n == 0:
+        return np.zeros((0, 0))
+    index = {p: i for i, p in enumerate(player_ids)}
+    home = np.array([index[h] for h, a in pending], dtype=np.int64)
+    away = np.array([index[a] for h, a in pending], dtype=np.int64)
+    attack, defense, home_rate, away_rate = fit_rates(player_ids, played)
+    home_cdf = poisson_cdf(home_rate * attack[home] * defense[away])
+    away_cdf = poisson_cdf(away_rate * attack[away] * defense[home])
+    batch = max(1, BATCH_CELLS // max(len(pending), 1))
+    batches = [batch] * (sims // batch) + ([sims % batch] if sims % batch else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(batches))
+    args = [(s, size, home, away, home_cdf, away_cdf, table["points"], table["gd"], table["goals_for"])
+            for s, size in zip(seeds, batches)]
+    if workers > 1 and len(batches) > 1:
+        counts = sum(process_pool(workers).map(simulate_batch, *zip(*args)))
+    else:
+        counts = sum(simulate_batch(*a) for a in args)
+    return counts / sims
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def get_position_probabilities(_conn, season_id, version, tiebreakers=ranking.DEFAULT_TIEBREAKERS,
+                               sims=DEFAULT_SIMULATIONS):
+    """Final-position probabilities as a player-name x position frame, recomputed per data version.
+
+    Seeded with the version, so every session sees the same numbers for the same results.
+    The tiebreak chain ranks a finished season, so it is part of the key too.
+    """
+    player_ids, table, played, pending = load_season(_conn, season_id)
+    names = standings.load_season_players(_conn, season_id)
+    if len(pending) > MAX_PENDING:
+        raise ValueError(f"{len(pending)} pending fixtures is more than the {MAX_PENDING} the budget can simulate")
+    if pending:
+        sims = min(sims, CELL_BUDGET // len(pending))
+        probabilities = simulate_positions(player_ids, table, played, pending, sims, seed=version)
+    else:
+        # Nothing left to play: the final table is the real one, ranked by the league's tiebreakers
+        leaderboard = standings.get_leaderboard(_conn, season_id, version, tiebreakers=tiebreakers)
+        position = {player: i for i, (player, _) in enumerate(leaderboard)}
+        probabilities = np.zeros((len(player_ids), len(player_ids)))
+        probabilities[np.arange(len(player_ids)), [position[names[p]] for p in player_ids]] = 1
+    return pd.DataFrame(probabilities, index=[names[p] for p in player_ids],
+                        columns=range(1, len(player_ids) + 1))
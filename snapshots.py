@@ -0,0 +1,143 @@
+import pandas as pd
+import streamlit as st
+from matplotlib.figure import Figure
+
+import leagues
+import ranking
+from standings import STANDINGS_COLUMNS
+
+# The table after round k is kept once rounds 1..k are all complete, so each
+# snapshot extends the previous one by a single round's results
+
+
+def completed_through(conn, season_id):
+    """Last round k such that rounds 1..k have no unplayed fixtures (0 if none)."""
+    row = conn.execute("SELECT MIN(round) FROM matches WHERE season_id = ? AND home_goals IS NULL",
+                       (season_id,)).fetchone()
+    if row[0] is not None:
+        return row[0] - 1
+    return conn.execute("SELECT COALESCE(MAX(round), 0) FROM matches WHERE season_id = ?", (season_id,)).fetchone()[0]
+
+
+def last_snapshot(conn, season_id):
+    return conn.execute("SELECT COALESCE(MAX(round), 0) FROM standings_snapshots WHERE season_id = ?",
+                        (season_id,)).fetchone()[0]
+
+
+def write_snapshots(conn, season_id):
+    """Snapshot every newly completed round; call inside a write transaction (BEGIN IMMEDIATE).
+
+    The high-water mark is read here, so holding the write lock from the start
+    keeps two writers from snapshotting the same round.
+    """
+    start, end = last_snapshot(conn, season_id), completed_through(conn, season_id)
+    if end <= start:
+        return
+    chain = leagues.load_season_tiebreakers(conn, season_id)
+    columns = ", ".join(STANDINGS_COLUMNS)
+    table = {p: dict.fromkeys(STANDINGS_COLUMNS, 0) for (p,) in conn.execute(
+        "SELECT p.id FROM players p JOIN seasons s ON s.league_id = p.league_id WHERE s.id = ?", (season_id,))}
+    for player_id, *stats in conn.execute(
+            f"SELECT player_id, {columns} FROM standings_snapshots WHERE season_id = ? AND round = ?",
+            (season_id, start)):
+        table[player_id] = dict(zip(STANDINGS_COLUMNS, stats))
+    for round_number in range(start + 1, end + 1):
+        results = conn.execute("SELECT home_id, away_id, home_goals, away_goals FROM matches "
+                               "WHERE season_id = ? AND round = ?", (season_id, round_number)).fetchall()
+        for home, away, home_goals, away_goals in results:
+            for player, gf, ga in ((home, home_goals, away_goals), (away, away_goals, home_goals)):
+                row = table[player]
+                row["played"] += 1
+                row["goals_for"] += gf
+                row["goals_against"] += ga
+                row["gd"] += gf - ga
+                row["wins"] += gf > ga
+                row["draws"] += gf == ga
+                row["losses"] += gf < ga
+                row["points"] += 3 * (gf > ga) + (gf == ga)
+        order = ranking.rank(
+            table, chain,
+            head_to_head=lambda: ranking.load_head_to_head(conn, season_id, round_number),
+            away_goals=lambda: ranking.load_away_goals(conn, season_id, round_number),
+        )
+        conn.executemany(
+            f"INSERT INTO standings_snapshots (season_id, round, player_id, position, {columns}) "
+            f"VALUES (?, ?, ?, ?, {', '.join('?' * len(STANDINGS_COLUMNS))})",
+            [(season_id, round_number, p, position, *(table[p][col] for col in STANDINGS_COLUMNS))
+             for position, p in enumerate(order, 1)]
+        )
+
+
+def replay_snapshots(conn, season_id):
+    """Replace a season's snapshots with a replay from scratch; call inside a write transaction."""
+    conn.execute("DELETE FROM standings_snapshots WHERE season_id = ?", (season_id,))
+    write_snapshots(conn, season_id)
+
+
+def rebuild_snapshots(conn, season_id):
+    """Replay a season's snapshots from scratch, e.g. after a result or the tiebreakers changed."""
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        replay_snapshots(conn, season_id)
+
+
+def ensure_snapshots(conn, season_id):
+    """Bring a season's snapshots up to date, replaying them if they miss results.
+
+    Snapshots go stale when results are removed along with a player; rounds
+    completed before snapshots existed are simply written now. The check and
+    the writes share one write transaction, like events.process().
+    """
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        last = last_snapshot(conn, season_id)
+        snapshot_games = conn.execute("SELECT COALESCE(SUM(played), 0) FROM standings_snapshots "
+                                      "WHERE season_id = ? AND round = ?", (season_id, last)).fetchone()[0]
+        games = conn.execute("SELECT COUNT(*) FROM matches WHERE season_id = ? AND round <= ? "
+                             "AND home_goals IS NOT NULL", (season_id, last)).fetchone()[0]
+        if snapshot_games != 2 * games:
+            replay_snapshots(conn, season_id)
+        else:
+            write_snapshots(conn, season_id)
+
+
+def table_at_round(conn, season_id, round_number):
+    """The table as it stood after a round: (player_id, position, *STANDINGS_COLUMNS) rows."""
+    columns = ", ".join(STANDINGS_COLUMNS)
+    return conn.execute(f"""SELECT player_id, position, {columns} FROM standings_snapshots
+                            WHERE season_id = ? AND round = ? ORDER BY position""",
+                        (season_id, round_number)).fetchall()
+
+
+def position_history(conn, season_id):
+    """Every player's position after each snapshotted round, as a round x player-name frame."""
+    frame = pd.read_sql("""SELECT ss.round, p.name, ss.position FROM standings_snapshots ss
+                           JOIN players p ON p.id = ss.player_id WHERE ss.season_id = ?""",
+                        conn, params=(season_id,))
+    return frame.pivot(index="round", columns="name", values="position")
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def get_position_history(_conn, season_id, version, tiebreakers=ranking.DEFAULT_TIEBREAKERS):
+    """position_history() per data version and tiebreak chain; a new chain re-ranks every snapshot."""
+    ensure_snapshots(_conn, season_id)
+    return position_history(_conn, season_id)
+
+
+def position_chart(history, players):
+    """Line chart of the given players' positions by round, leader at the top.
+
+    Built on a bare Figure rather than pyplot, whose global state isn't safe across session threads.
+    """
+    fig = Figure(figsize=(10, 4))
+    ax = fig.subplots()
+    for player in players:
+        ax.plot(history.index, history[player], marker="o", markersize=3, label=player)
+    ax.invert_yaxis()
+    ax.set_xlabel("Round")
+    ax.set_ylabel("Position")
+    ax.set_yticks(range(1, len(history.columns) + 1, max(1, len(history.columns) // 10)))
+    ax.grid(alpha=0.3)
+    ax.legend(loc="center left", bbox_to_anchor=(1, 0.5), fontsize="small")
+    fig.tight_layout()
+    return fig
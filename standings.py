@@ -0,0 +1,165 @@
+import os
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import ranking
+
+STANDINGS_COLUMNS = ["points", "gd", "played", "wins", "draws", "losses", "goals_for", "goals_against"]
+
+# How the leaderboard is produced: "table" reads the trigger-maintained standings,
+# "loop" replays the played matches row by row and "pandas" aggregates them column-wise
+STANDINGS_METHODS = ("table", "loop", "pandas")
+DEFAULT_METHOD = os.environ.get("PES_STANDINGS_METHOD", "table")
+
+
+# Seconds between an open Dashboard's checks of the league versions for new results and kickoffs
+LIVE_POLL_SECONDS = float(os.environ.get("PES_LIVE_POLL_SECONDS", 10))
+
+
+def data_version(conn, league_id):
+    """Counter bumped whenever the league's players, seasons, fixtures or results are written.
+
+    Moving a kickoff leaves it alone; see schedule_version.
+    """
+    row = conn.execute("SELECT data_version FROM leagues WHERE id = ?", (league_id,)).fetchone()
+    return row[0] if row else 0
+
+
+def schedule_version(conn, league_id):
+    """Counter bumped whenever one of the league's kickoffs moves."""
+    row = conn.execute("SELECT schedule_version FROM leagues WHERE id = ?", (league_id,)).fetchone()
+    return row[0] if row else 0
+
+
+def load_season_summary(conn, season_id):
+    """Fixture counts, goals and the next round of a season in one aggregate over its matches."""
+    total, completed, goals, next_round, next_kickoff = conn.execute(
+        """SELECT COUNT(*), COUNT(home_goals), COALESCE(SUM(home_goals + away_goals), 0),
+                  MIN(CASE WHEN home_goals IS NULL THEN round END),
+                  MIN(CASE WHEN home_goals IS NULL THEN kickoff END)
+           FROM matches WHERE season_id = ?""", (season_id,)
+    ).fetchone()
+    return {
+        "total_matches": total,
+        "completed_matches": completed,
+        "pending_matches": total - completed,
+        "total_goals": goals,
+        "progress": completed / total if total > 0 else 0,
+        "next_round": next_round,
+        "next_kickoff": next_kickoff,
+    }
+
+
+def to_leaderboard(rows):
+    """Turn (player, *STANDINGS_COLUMNS) rows into the (player, stats) pairs the pages render."""
+    return [
+        (player, {"Points": points, "GD": gd, "Matches Played": played, "Wins": wins, "Draws": draws,
+                  "Losses": losses, "Goals For": gf, "Goals Against": ga})
+        for player, points, gd, played, wins, draws, losses, gf, ga in rows
+    ]
+
+
+def load_standings(conn, season_id):
+    """Read the trigger-maintained standings as (player_id, *STANDINGS_COLUMNS) rows."""
+    columns = ", ".join(STANDINGS_COLUMNS)
+    c = conn.execute(f"SELECT player_id, {columns} FROM standings WHERE season_id = ?", (season_id,))
+    return c.fetchall()
+
+
+def load_players(conn, league_id):
+    """A league's registered players as an id -> name map, in registration order."""
+    return dict(conn.execute("SELECT id, name FROM players WHERE league_id = ? ORDER BY id", (league_id,)).fetchall())
+
+
+def load_season_players(conn, season_id):
+    return dict(conn.execute("""SELECT p.id, p.name FROM players p JOIN seasons s ON s.league_id = p.league_id
+                                WHERE s.id = ? ORDER BY p.id""", (season_id,)).fetchall())
+
+
+def load_matches_frame(conn, season_id):
+    """Every fixture of a season in one columnar read; pending fixtures have NaN goals."""
+    return pd.read_sql("SELECT home_id, away_id, home_goals, away_goals FROM matches WHERE season_id = ?",
+                       conn, params=(season_id,))
+
+
+def compute_standings_loop(players, results):
+    """Reference implementation: replay (home, away, home_goals, away_goals) results one by one."""
+    standings = {p: dict.fromkeys(STANDINGS_COLUMNS, 0) for p in players}
+    for home, away, home_goals, away_goals in results:
+        for player, gf, ga in ((home, home_goals, away_goals), (away, away_goals, home_goals)):
+            row = standings[player]
+            row["played"] += 1
+            row["goals_for"] += gf
+            row["goals_against"] += ga
+            row["gd"] += gf - ga
+            if gf > ga:
+                row["points"] += 3
+                row["wins"] += 1
+            elif gf < ga:
+                row["losses"] += 1
+            else:
+                row["points"] += 1
+                row["draws"] += 1
+    ranked = sorted(standings.items(), key=lambda x: (-x[1]["points"], -x[1]["gd"]))
+    return [(player, *(row[col] for col in STANDINGS_COLUMNS)) for player, row in ranked]
+
+
+def compute_standings_frame(players, frame):
+    """Vectorized standings: one row per player indexed by id, ranked like the loop."""
+    played = frame.dropna(subset=["home_goals", "away_goals"])
+    home_goals = played["home_goals"].to_numpy(dtype=np.int64)
+    away_goals = played["away_goals"].to_numpy(dtype=np.int64)
+    # One row per (player, match) from both sides of each fixture
+    long = pd.DataFrame({
+        "player": np.concatenate([played["home_id"].to_numpy(), played["away_id"].to_numpy()]),
+        "goals_for": np.concatenate([home_goals, away_goals]),
+        "goals_against": np.concatenate([away_goals, home_goals]),
+    })
+    diff = long["goals_for"] - long["goals_against"]
+    long["wins"] = (diff > 0).astype(np.int64)
+    long["draws"] = (diff == 0).astype(np.int64)
+    long["losses"] = (diff < 0).astype(np.int64)
+    long["played"] = 1
+    table = long.groupby("player").sum().reindex(players, fill_value=0)
+    table["gd"] = table["goals_for"] - table["goals_against"]
+    table["points"] = 3 * table["wins"] + table["draws"]
+    table = table[STANDINGS_COLUMNS].astype(np.int64)
+    return table.sort_values(["points", "gd"], ascending=False, kind="stable")
+
+
+def compute_leaderboard(conn, season_id, method=DEFAULT_METHOD, tiebreakers=ranking.DEFAULT_TIEBREAKERS):
+    """Season standings by the chosen method, ordered by points and the league's tiebreakers."""
+    players = load_season_players(conn, season_id)
+    if method == "table":
+        rows = load_standings(conn, season_id)
+    elif method == "loop":
+        c = conn.execute("""SELECT home_id, away_id, home_goals, away_goals FROM matches
+                            WHERE season_id = ? AND home_goals IS NOT NULL AND away_goals IS NOT NULL""",
+                         (season_id,))
+        rows = compute_standings_loop(players, c.fetchall())
+    elif method == "pandas":
+        rows = compute_standings_frame(list(players), load_matches_frame(conn, season_id)).itertuples(name=None)
+    else:
+        raise ValueError(f"Unknown standings method {method!r}, expected one of {STANDINGS_METHODS}")
+    table = {player_id: dict(zip(STANDINGS_COLUMNS, stats)) for player_id, *stats in rows}
+    order = ranking.rank(table, tiebreakers,
+                         head_to_head=lambda: ranking.load_head_to_head(conn, season_id),
+                         away_goals=lambda: ranking.load_away_goals(conn, season_id))
+    return to_leaderboard((players[i], *(table[i][col] for col in STANDINGS_COLUMNS)) for i in order)
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def get_leaderboard(_conn, season_id, version, method=DEFAULT_METHOD, tiebreakers=ranking.DEFAULT_TIEBREAKERS):
+    """Season leaderboard shared by every session until the league's data version or tiebreakers change."""
+    return compute_leaderboard(_conn, season_id, method, tuple(tiebreakers))
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def get_season_summary(_conn, season_id, version, schedule_version):
+    """The season summary every dashboard card and page guard reads, refreshed per data and schedule version.
+
+    The schedule version is part of the key because the summary includes the next kickoff.
+    """
+    return load_season_summary(_conn, season_id)
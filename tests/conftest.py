@@ -0,0 +1,40 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# The app is a set of top-level modules run from the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import db  # noqa: E402
+import leagues  # noqa: E402
+import standings  # noqa: E402
+
+
+@pytest.fixture
+def conn(tmp_path):
+    """A connection to a freshly migrated database file."""
+    conn = db.connect(str(tmp_path / "league.db"))
+    db.migrate(conn)
+    yield conn
+    conn.close()
+
+
+def make_season(conn, names, fixtures=()):
+    """A new league of the named players with one season holding the given fixtures.
+
+    fixtures are (home, away, round) tuples of player names, optionally followed
+    by home_goals, away_goals and an ISO kickoff. Returns (league_id, season_id,
+    name -> player id).
+    """
+    number = conn.execute("SELECT COUNT(*) FROM leagues").fetchone()[0] + 1
+    league_id = leagues.create_league(conn, f"League {number}", max(2, len(names)), "Season 1")
+    season_id = leagues.load_seasons(conn, league_id)[0][0]
+    with conn:
+        conn.executemany("INSERT INTO players (league_id, name) VALUES (?, ?)", [(league_id, name) for name in names])
+        ids = {name: player_id for player_id, name in standings.load_players(conn, league_id).items()}
+        conn.executemany("INSERT INTO matches (season_id, home_id, away_id, round, home_goals, away_goals, kickoff) "
+                         "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                         [(season_id, ids[home], ids[away], round_number, *(list(rest) + [None] * 3)[:3])
+                          for home, away, round_number, *rest in fixtures])
+    return league_id, season_id, ids
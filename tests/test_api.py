@@ -0,0 +1,29 @@
+import pytest
+
+import api
+from conftest import make_season
+
+
+@pytest.fixture
+def season(conn):
+    """Three players in a single round robin, unplayed."""
+    return make_season(conn, "abc", [("a", "b", 1), ("b", "c", 2), ("c", "a", 3)])[1]
+
+
+def test_fixture_pages_end_without_a_cursor(conn, season):
+    first = api.get_fixtures(conn, season, None, {"limit": ["2"]})
+    assert len(first["fixtures"]) == 2 and first["next"]
+    last = api.get_fixtures(conn, season, None, {"limit": ["2"], "after": [first["next"]]})
+    assert len(last["fixtures"]) == 1 and last["next"] is None
+    assert api.get_fixtures(conn, season, None, {"limit": ["3"]})["next"] is None
+
+
+@pytest.mark.parametrize("limit, size", [("-1", 1), ("0", 1), ("1000", 3)])
+def test_limit_is_clamped(conn, season, limit, size):
+    assert len(api.get_fixtures(conn, season, None, {"limit": [limit]})["fixtures"]) == size
+
+
+@pytest.mark.parametrize("after", ["5", "1,2,3", "1,x", ""])
+def test_malformed_cursor_is_rejected(conn, season, after):
+    with pytest.raises(ValueError):
+        api.get_fixtures(conn, season, None, {"after": [after]})
@@ -0,0 +1,37 @@
+import pytest
+
+import bulk
+from conftest import make_season
+
+
+def write(tmp_path, text):
+    path = tmp_path / "results.csv"
+    path.write_text("round,home,away,home_goals,away_goals\n" + text)
+    return path
+
+
+def test_rejects_rounds_and_goals_that_are_not_whole_numbers(conn, tmp_path):
+    _, season_id, _ = make_season(conn, "abc")
+    path = write(tmp_path, "1,a,b,inf,0\n2.7,b,c,,\n1,c,a,-1,0\n1,a,c,1.5,1\n,b,a,1,1\n")
+    with pytest.raises(bulk.InvalidFile) as error:
+        bulk.import_results(conn, season_id, path)
+    assert error.value.problems == [
+        "Row 2: goals must be a whole number, got inf",
+        "Row 3: round must be a whole number, got 2.7",
+        "Row 4: goals can't be negative",
+        "Row 5: goals must be a whole number, got 1.5",
+        "Row 6: round is missing",
+    ]
+    assert conn.execute("SELECT COUNT(*) FROM matches").fetchone()[0] == 0
+
+
+def test_all_numeric_fractional_round_is_rejected(conn, tmp_path):
+    _, season_id, _ = make_season(conn, "ab")
+    with pytest.raises(bulk.InvalidFile, match="round must be a whole number, got 2.7"):
+        bulk.import_results(conn, season_id, write(tmp_path, "2.7,a,b,,\n"))
+
+
+def test_whole_floats_are_accepted(conn, tmp_path):
+    _, season_id, _ = make_season(conn, "ab")
+    assert bulk.import_results(conn, season_id, write(tmp_path, "2.0,a,b,3.0,1\n")) == (1, 1, 0)
+    assert conn.execute("SELECT round, home_goals, away_goals FROM matches").fetchall() == [(2, 3, 1)]
@@ -0,0 +1,100 @@
+import sqlite3
+import threading
+
+import pytest
+
+import db
+import events
+import ratings
+import snapshots
+import standings
+from conftest import make_season
+
+
+@pytest.fixture
+def season(conn):
+    """Eight players, one round robin of 28 fixtures, nothing played."""
+    names = [f"Player {i}" for i in range(8)]
+    return make_season(conn, names, [(home, away, 1 + (i + j) % 7) for i, home in enumerate(names)
+                                     for j, away in enumerate(names) if i < j])[1]
+
+
+def test_concurrent_writers_apply_each_event_once(conn, season):
+    """Admins saving scores while viewers fill snapshots in: every event is applied exactly once."""
+    path = conn.execute("PRAGMA database_list").fetchone()[2]
+    conn.execute("PRAGMA journal_mode = WAL")
+    pending = [match_id for (match_id,) in conn.execute("SELECT id FROM matches ORDER BY round, id")]
+    errors = []
+
+    def admin(match_ids):
+        own = db.connect(path)
+        try:
+            for match_id in match_ids:
+                with own:
+                    events.record_result(own, match_id, match_id % 4, match_id % 3)
+                events.process(own, season)
+        except Exception as e:
+            errors.append(e)
+
+    def viewer():
+        own = db.connect(path)
+        try:
+            for _ in range(20):
+                snapshots.ensure_snapshots(own, season)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=admin, args=(pending[i::4],)) for i in range(4)]
+    threads += [threading.Thread(target=viewer) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+
+    _, games = ratings.load_ratings(conn, season)
+    assert sum(games.values()) == 2 * len(pending)
+    incremental = ratings.load_ratings(conn, season)[0]
+    assert ratings.rebuild_ratings(conn, season) == pytest.approx(incremental)
+    assert snapshots.last_snapshot(conn, season) == 7
+    assert len(snapshots.table_at_round(conn, season, 7)) == 8
+
+
+def test_log_is_append_only(conn, season):
+    match_id = conn.execute("SELECT MIN(id) FROM matches").fetchone()[0]
+    with conn:
+        events.record_result(conn, match_id, 1, 0)
+    for sql in ("UPDATE match_events SET home_goals = 5", "DELETE FROM match_events"):
+        with pytest.raises(sqlite3.IntegrityError, match="append-only"):
+            with conn:
+                conn.execute(sql)
+    with conn:
+        conn.execute("DELETE FROM seasons WHERE id = ?", (season,))
+    assert conn.execute("SELECT COUNT(*) FROM match_events WHERE season_id = ?", (season,)).fetchone()[0] == 1
+
+
+def test_batched_results_skip_played_fixtures(conn, season):
+    first, second = [match_id for (match_id,) in conn.execute("SELECT id FROM matches ORDER BY id LIMIT 2")]
+    with conn:
+        events.record_result(conn, first, 1, 0)
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        recorded = events.record_results(conn, [(5, 5, first), (2, 2, second), (3, 3, second)], "admin")
+    assert recorded == [(2, 2, second)]
+    assert conn.execute("SELECT home_goals FROM matches WHERE id IN (?, ?) ORDER BY id", (first, second)).fetchall() \
+        == [(1,), (2,)]
+    assert [kind for (kind,) in conn.execute("SELECT kind FROM match_events ORDER BY seq")] == ["result", "result"]
+    assert events.audit(conn, season) == []
+
+
+def test_kickoff_changes_leave_the_results_version(conn, season):
+    league_id = conn.execute("SELECT league_id FROM seasons WHERE id = ?", (season,)).fetchone()[0]
+    before = standings.data_version(conn, league_id), standings.schedule_version(conn, league_id)
+    match_id = conn.execute("SELECT MIN(id) FROM matches").fetchone()[0]
+    with conn:
+        events.change_kickoffs(conn, [("2026-05-01T21:00", match_id)])
+    assert standings.data_version(conn, league_id) == before[0]
+    assert standings.schedule_version(conn, league_id) == before[1] + 1
+    with conn:
+        events.record_result(conn, match_id, 0, 0)
+    assert standings.data_version(conn, league_id) > before[0]
@@ -0,0 +1,31 @@
+import threading
+
+import db
+from migrations import MIGRATIONS
+
+
+def test_concurrent_migrations_apply_once(tmp_path):
+    """Two processes opening a new database together, e.g. the app and api.py."""
+    path = str(tmp_path / "new.db")
+    barrier = threading.Barrier(2)
+    errors = []
+
+    def open_database():
+        conn = db.connect(path)
+        barrier.wait()
+        try:
+            db.migrate(conn)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            conn.close()
+
+    threads = [threading.Thread(target=open_database) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    conn = db.connect(path)
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == len(MIGRATIONS)
+    conn.close()
@@ -0,0 +1,97 @@
+import re
+from datetime import date
+
+import pytest
+
+import events
+import player_stats
+import ranking
+import ratings
+import scheduling
+import snapshots
+import standings
+from conftest import make_season
+
+# Queries main.py runs inline rather than through a module function
+MAIN_QUERIES = [
+    "SELECT DISTINCT round FROM matches WHERE season_id = :season AND home_goals IS NULL AND away_goals IS NULL "
+    "ORDER BY round",
+    "SELECT id, home_id, away_id FROM matches WHERE season_id = :season AND round = 2 AND home_goals IS NULL "
+    "AND away_goals IS NULL",
+    "SELECT id, home_id, away_id, round, home_goals, away_goals FROM matches "
+    "WHERE season_id = :season AND home_goals IS NOT NULL ORDER BY round DESC, id",
+    "SELECT id, round, home_id, away_id FROM matches WHERE season_id = :season AND home_goals IS NULL "
+    "ORDER BY round, id",
+]
+# A plan step reading a whole table or index; scans of subquery results are fine
+FULL_SCAN = re.compile(r"SCAN (?!\(|CONSTANT ROW)")
+
+
+@pytest.fixture
+def season(conn):
+    """A six-player double round robin with kickoffs and the first rounds played."""
+    names = [f"Player {i}" for i in range(6)]
+    fixtures = scheduling.allocate_kickoffs(scheduling.generate_fixtures(names, 2, True), start=date(2026, 3, 1))
+    league_id, season_id, ids = make_season(
+        conn, names, [(f.home, f.away, f.round, None, None, f.kickoff.isoformat(timespec="minutes")) for f in fixtures])
+    played = [match_id for (match_id,) in conn.execute(
+        "SELECT id FROM matches WHERE season_id = ? AND round <= 3", (season_id,))]
+    with conn:
+        events.record_results(conn, [(2, 1, match_id) for match_id in played])
+    events.process(conn, season_id)
+    return league_id, season_id, list(ids.values())
+
+
+def issued_queries(conn, league_id, season_id, players):
+    """Every statement the pages' reads and score writes send, captured with their bound values."""
+    statements = []
+    conn.set_trace_callback(statements.append)
+    try:
+        scheduling.load_rounds(conn, season_id)
+        for player_id in (None, players[0]):
+            for round_number in (None, 2):
+                for after in (None, (2, 5)):
+                    scheduling.load_schedule_page(conn, season_id, player_id, round_number, after)
+        scheduling.load_upcoming(conn, season_id, limit=100)
+        scheduling.load_recent_results(conn, season_id)
+        standings.data_version(conn, league_id)
+        standings.load_season_summary(conn, season_id)
+        standings.load_standings(conn, season_id)
+        player_stats.load_player_results(conn, season_id)
+        ranking.load_head_to_head(conn, season_id)
+        ranking.load_away_goals(conn, season_id)
+        ratings.ensure_ratings(conn, season_id)
+        snapshots.ensure_snapshots(conn, season_id)
+        snapshots.table_at_round(conn, season_id, 1)
+        snapshots.position_history(conn, season_id)
+        events.load_events(conn, season_id, 1)
+        events.audit(conn, season_id)
+        events.load_history(conn, season_id)
+        with conn:
+            pending = conn.execute("SELECT id FROM matches WHERE season_id = ? AND home_goals IS NULL LIMIT 1",
+                                   (season_id,)).fetchone()[0]
+            events.record_results(conn, [(1, 1, pending)])
+            events.record_result(conn, pending, 1, 1)
+            events.correct_result(conn, pending, 2, 2)
+            events.void_result(conn, pending)
+            events.change_kickoffs(conn, [("2026-04-01T20:00", pending)])
+        events.process(conn, season_id)
+    finally:
+        conn.set_trace_callback(None)
+    statements += [sql.replace(":season", str(season_id)) for sql in MAIN_QUERIES]
+    return [sql for sql in statements if sql.lstrip().split()[0].upper() in ("SELECT", "INSERT", "UPDATE", "DELETE")]
+
+
+def test_no_full_table_scans(conn, season):
+    league_id, season_id, players = season
+    scans = []
+    for sql in issued_queries(conn, league_id, season_id, players):
+        for *_, detail in conn.execute(f"EXPLAIN QUERY PLAN {sql}"):
+            if FULL_SCAN.match(detail):
+                scans.append(f"{detail}: {' '.join(sql.split())}")
+    assert not scans, "\n".join(scans)
+
+
+def test_detects_full_scan(conn):
+    (*_, detail), = conn.execute("EXPLAIN QUERY PLAN SELECT * FROM matches WHERE kickoff = 'x'")
+    assert FULL_SCAN.match(detail)
@@ -0,0 +1,44 @@
+import pytest
+
+import events
+import ratings
+from conftest import make_season
+
+
+@pytest.fixture
+def season(conn):
+    """Four players, two rounds of two fixtures, nothing played."""
+    _, season_id, _ = make_season(conn, "abcd", [("a", "b", 1), ("c", "d", 1), ("a", "c", 2), ("b", "d", 2)])
+    return season_id, [match_id for (match_id,) in conn.execute("SELECT id FROM matches ORDER BY round, id")]
+
+
+def stored(conn, season_id):
+    return ratings.load_ratings(conn, season_id)[0]
+
+
+def test_rebuild_replays_entry_order(conn, season):
+    season_id, (r1a, r1b, r2a, r2b) = season
+    # Round 2 is entered before round 1
+    for match_id, goals in ((r2a, (3, 0)), (r2b, (1, 1)), (r1a, (0, 2)), (r1b, (4, 1))):
+        with conn:
+            events.record_result(conn, match_id, *goals)
+        events.process(conn, season_id)
+    incremental = stored(conn, season_id)
+    assert ratings.rebuild_ratings(conn, season_id) == pytest.approx(incremental)
+
+
+def test_correction_keeps_its_place(conn, season):
+    season_id, (r1a, r1b, r2a, r2b) = season
+    with conn:
+        events.record_results(conn, [(2, 0, r2a), (1, 0, r1a)])
+    events.process(conn, season_id)
+    with conn:
+        events.correct_result(conn, r2a, 0, 0)
+        events.record_result(conn, r1b, 2, 2)
+    events.process(conn, season_id)
+    fixtures = {match_id: (home, away) for match_id, home, away in conn.execute(
+        "SELECT id, home_id, away_id FROM matches WHERE season_id = ?", (season_id,))}
+    # The corrected 0-0 stays first, where its result was entered
+    expected = {}
+    ratings.update(expected, {}, [(*fixtures[r2a], 0, 0), (*fixtures[r1a], 1, 0), (*fixtures[r1b], 2, 2)])
+    assert stored(conn, season_id) == pytest.approx(expected)
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+import simulation
+import standings
+from conftest import make_season
+
+# Three players level on points: a on goal difference and away goals, then b and c split by the chain
+CYCLE = [("a", "b", 1, 3, 0), ("b", "c", 2, 1, 0), ("c", "a", 3, 2, 1)]
+
+
+def test_finished_season_matches_the_table(conn):
+    """The tiebreak chain decides a finished season, not a coin toss, and changing it reorders."""
+    league_id, season_id, _ = make_season(conn, "abc", CYCLE)
+    version = standings.data_version(conn, league_id)
+    orders = []
+    # Goal difference puts c second; away goals leave b and c in registration order
+    for tiebreakers in (("gd",), ("away_goals",)):
+        probabilities = simulation.get_position_probabilities(conn, season_id, version, tiebreakers)
+        leaderboard = standings.get_leaderboard(conn, season_id, version, tiebreakers=tiebreakers)
+        orders.append([player for player, _ in leaderboard])
+        assert np.array_equal(probabilities.loc[orders[-1]].to_numpy(), np.eye(3))
+    assert orders == [["a", "c", "b"], ["a", "b", "c"]]
+
+
+def test_too_many_pending_fixtures(conn, monkeypatch):
+    league_id, season_id, _ = make_season(conn, "abcd", [("a", "b", 1), ("c", "d", 1)])
+    monkeypatch.setattr(simulation, "MAX_PENDING", 1)
+    with pytest.raises(ValueError):
+        simulation.get_position_probabilities(conn, season_id, standings.data_version(conn, league_id))
@@ -0,0 +1,19 @@
+import leagues
+import snapshots
+import standings
+from conftest import make_season
+from test_simulation import CYCLE
+
+
+def test_history_follows_a_new_tiebreak_chain(conn):
+    league_id, season_id, ids = make_season(conn, "abc", CYCLE)
+    version = standings.data_version(conn, league_id)
+    names = {player_id: name for name, player_id in ids.items()}
+    orders = []
+    for chain in (("gd",), ("wins", "away_goals")):
+        leagues.set_tiebreakers(conn, league_id, chain)
+        snapshots.rebuild_snapshots(conn, season_id)
+        history = snapshots.get_position_history(conn, season_id, version, leagues.load_tiebreakers(conn, league_id))
+        orders.append(list(history.loc[3].sort_values().index))
+        assert orders[-1] == [names[row[0]] for row in snapshots.table_at_round(conn, season_id, 3)]
+    assert orders == [["a", "c", "b"], ["a", "b", "c"]]
@@ -0,0 +1,43 @@
+import random
+
+import pytest
+
+import standings
+from conftest import make_season
+
+
+def random_season(conn, seed):
+    """A league of random size with random fixtures, some pending and some players without games."""
+    rng = random.Random(seed)
+    names = [f"Player {i}" for i in range(rng.randint(2, 12))]
+    # Leave a few players out of every fixture
+    active = names[:max(2, len(names) - rng.randint(0, 2))]
+    fixtures = []
+    for round_number in range(1, rng.randint(1, 6) + 1):
+        for home, away in zip(active[::2], active[1::2]):
+            if rng.random() < 0.2:
+                fixtures.append((home, away, round_number))
+            else:
+                fixtures.append((home, away, round_number, rng.randint(0, 5), rng.randint(0, 5)))
+        rng.shuffle(active)
+    return make_season(conn, names, fixtures)[1]
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_methods_agree(conn, seed):
+    season_id = random_season(conn, seed)
+    expected = standings.compute_leaderboard(conn, season_id, method="table")
+    for method in ("loop", "pandas"):
+        assert standings.compute_leaderboard(conn, season_id, method=method) == expected
+
+
+def test_pending_only_season(conn):
+    _, season_id, _ = make_season(conn, "abc", [("a", "b", 1)])
+    boards = [standings.compute_leaderboard(conn, season_id, method=m) for m in standings.STANDINGS_METHODS]
+    assert boards[0] == boards[1] == boards[2]
+    assert all(stats["Matches Played"] == 0 for _, stats in boards[0])
+
+
+def test_unknown_method(conn):
+    with pytest.raises(ValueError):
+        standings.compute_leaderboard(conn, 1, method="abacus")